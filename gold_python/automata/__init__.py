@@ -6,3 +6,5 @@ containing the file as packages.
 """
 from gold_python.automata.deterministic import *
 from gold_python.automata.nondeterministic import NonDeterministicAutomata
+from gold_python.automata.parallel import run_corpus
+from gold_python.automata.scan import Lexer, tokenize
@@ -1,11 +1,9 @@
 from typing import Iterable, Any, Tuple, List
-from threading import Lock
 import networkx as nx
-from anytree import Node
 import abc
 
 from gold_python.exceptions import SymbolNotFoundException
-from gold_python.automata.util import Function
+from gold_python.automata.util import Function, as_states
 
 
 class AbstractAutomata(abc.ABC):
@@ -16,6 +14,8 @@ class AbstractAutomata(abc.ABC):
     attributes and methods that all automata should have.
     """
 
+    _network: nx.DiGraph | None = None
+
     def __init__(
         self,
         states: Iterable,
@@ -24,14 +24,32 @@ class AbstractAutomata(abc.ABC):
         final_states: Tuple | List,
         delta: Function,
     ) -> None:
-        self.states = set(
-            [tuple(state) if isinstance(state, List) else state for state in states]
-        )
+        self.states = as_states(states)
         self.alphabet = set(alphabet)
         self.initial_state = initial_state
         self.final_states = set(final_states)
         self.delta = delta
-        self.network = nx.DiGraph()
+
+    @property
+    def network(self) -> nx.DiGraph:
+        """
+        The graph of the automata, used for visualization.
+
+        The graph is built the first time it is accessed, so automata that are never
+        visualized do not pay for it.
+        """
+        if self._network is None:
+            self._network = self._build_network()
+        return self._network
+
+    @network.setter
+    def network(self, network: nx.DiGraph) -> None:
+        self._network = network
+
+    def _build_network(self) -> nx.DiGraph:
+        network = nx.DiGraph()
+        network.add_nodes_from([str(state) for state in self.states])
+        return network
 
     def _input_allowed(self, tape: str) -> None:
         for symbol in tape:
@@ -66,20 +84,20 @@ class AbstractNonDeterministicAutomata(AbstractAutomata):
         final_states: Tuple | List,
         delta: Function,
     ) -> None:
-        self.states = set(states)
+        self.states = as_states(states)
         self.alphabet = set(alphabet)
         self.initial_state = initial_state
         self.final_states = set(final_states)
         self.delta = delta
-        self.network = nx.DiGraph()
-        self.lock = Lock()
 
-        self.network.add_nodes_from([str(state) for state in self.states])
+    @abc.abstractmethod
+    def _new_queue(self):
+        pass
 
     @abc.abstractmethod
-    def _prepare_queue(self, root: Node, tape: str, queue):
+    def _prepare_queue(self, tape: str, queue):
         pass
 
     @abc.abstractmethod
-    def _insert_node(self, state, parent, next):
+    def _run_task(self, task, queue, return_queue, trace: bool = True, visited=None):
         pass
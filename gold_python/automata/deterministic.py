@@ -6,18 +6,23 @@ The automatons in this module are deterministic, meaning that for each state and
 There is also a class for deterministic transducers, which are deterministic automata with output. The output is a string of symbols from an output alphabet, which is defined in the transducer.
 """
 
+import os
 from collections import defaultdict
-from typing import Iterable, Any, List, Tuple
+from typing import Iterable, Iterator, Any, List, TextIO, Tuple
 import networkx as nx
-from gold_python.exceptions import (
-    PathNotFoundException,
-    MultiplePathsFoundException,
-    StateNotFoundException,
-    OutputSymbolNotFoundException,
-)
-from gold_python.util import call_func_iterable
-from gold_python.automata.util import Function
+import numpy as np
+from gold_python.automata.util import Function, as_state, as_states
 from gold_python.automata.abstract import AbstractAutomata
+from gold_python.automata.scan import Scanner
+from gold_python.automata.table import (
+    TransitionTable,
+    TableDelta,
+    TableOutput,
+    MmapMode,
+    Tape,
+    load_table,
+)
+from gold_python.exceptions import TableFormatException
 
 
 class DeterministicAutomata(AbstractAutomata):
@@ -32,10 +37,32 @@ class DeterministicAutomata(AbstractAutomata):
         initial_state (Tuple | Any): The initial state of the automata
         final_states (Tuple | List): An iterable containing all final states of the automata
         delta (Function): A function that takes as input a state and a symbol and returns the next state of the automata
+        reachable (bool): Whether to only compile the states reachable from the initial state
+        workers (int | None): The number of processes calling the delta function when the automata is created
 
     The delta function will usually be decorated with the deltafunc decorator from the delta module.
+
+    The delta function is called once for every state and symbol when the automata is created,
+    and the results are compiled into a TransitionTable, so running the automata does not call
+    the delta function again. With reachable=True, the delta function is only called for the
+    states reachable from the initial state, found breadth-first, and the states given are only
+    used to check that every transition leads to one of them. The delta function then doesn't
+    need to be defined on unreachable states. With workers, the calls to the delta function are
+    split between a pool of processes, see TransitionTable.from_function.
+
+    States can be given as a state space from the sets module, such as a ProductSpace, which
+    is kept as it is instead of being copied into a set, and indexes its states arithmetically.
+
+    Automata over the same alphabet can be combined with the &, |, - and ~ operators, which
+    build the product of their transition tables, so several automata are run in a single pass.
+
+    Besides strings, inputs can be given as bytes, bytearray, memoryview or mmap objects, which
+    are read as a sequence of byte values. When every symbol of the alphabet is a byte value
+    (an int from 0 to 255), those inputs are run through a table with an entry for each byte.
     """
 
+    _scanner: Scanner | None = None
+
     def __init__(
         self,
         states: Iterable,
@@ -43,56 +70,276 @@ class DeterministicAutomata(AbstractAutomata):
         initial_state: Tuple | Any,
         final_states: Tuple | List,
         delta: Function,
+        reachable: bool = False,
+        workers: int | None = None,
     ) -> None:
         # Convert states to a set of tuples if lists, otherwise leave them as is
-        self.states = set(
-            [tuple(state) if isinstance(state, list) else state for state in states]
-        )
+        self.states = as_states(states)
         self.alphabet = set(alphabet)
-        self.initial_state = initial_state
+        self.initial_state = as_state(initial_state)
         self.final_states = set(final_states)
         self.delta = delta
 
-        # Create network
-        self.network = nx.DiGraph()
-        self.network.add_nodes_from([str(state) for state in self.states])
+        # Compile every transition into a table, validating them along the way
+        self.table = TransitionTable.from_function(
+            self.states,
+            self.alphabet,
+            self.initial_state,
+            self.final_states,
+            delta,
+            reachable,
+            workers,
+        )
 
-        # Map to store edges between states
-        edge_map = defaultdict(list)
+    @classmethod
+    def from_table(cls, table: TransitionTable) -> "DeterministicAutomata":
+        """
+        Create a deterministic automata from an already compiled transition table.
 
-        # Iterate through all states and symbols to create edges
-        for state in self.states:
-            for symbol in self.alphabet:
-                nextStates = call_func_iterable(self.delta, state, symbol)
+        Args:
+            table (TransitionTable): The compiled transitions of the automata
+        Returns:
+            DeterministicAutomata: An automata running over the given table
 
-                if len(nextStates) < 1:
-                    raise PathNotFoundException(symbol, state)
-                elif len(nextStates) > 1:
-                    raise MultiplePathsFoundException(symbol, state)
+        The delta function of the created automata looks up the transitions in the table.
+        """
+        automata = cls.__new__(cls)
+        automata._init_from_table(table)
+        return automata
+
+    def _init_from_table(self, table: TransitionTable) -> None:
+        # Shared by the from_table constructors, which don't call __init__
+        self.states = as_states(table.states)
+        self.alphabet = set(table.symbols)
+        self.initial_state = table.states[table.initial]
+        self.final_states = set(
+            state for state, final in zip(table.states, table.final) if final
+        )
+        self.delta = TableDelta(table)
+        self.table = table
 
-                if nextStates[0] not in self.states:
-                    raise StateNotFoundException(symbol, state, nextStates[0])
+    def save(self, path: str | os.PathLike) -> None:
+        """
+        Save the compiled form of this automata to a directory.
+
+        Args:
+            path (str | os.PathLike): The directory to save the automata to, created if it doesn't exist
 
-                # Append symbol to edge and create a comma-separated list
-                edge_map[str(state), str(nextStates[0])].append(symbol)
-                symbol_list = ", ".join(edge_map[str(state), str(nextStates[0])])
+        Only the transition table is saved, so loading the automata does not call the delta
+        function again. See TransitionTable.save for the files written.
+        """
+        self.table.save(path, kind="deterministic")
 
-                # Add edge to network
-                self.network.add_edge(str(state), str(nextStates[0]), label=symbol_list)
+    @classmethod
+    def load(
+        cls, path: str | os.PathLike, mmap_mode: MmapMode | None = "r"
+    ) -> "DeterministicAutomata":
+        """
+        Load an automata saved with save.
 
-    def accepts_input(self, tape: str) -> bool:
-        self._input_allowed(tape)
-        currentState = self.initial_state
+        Args:
+            path (str | os.PathLike): The directory the automata was saved to
+            mmap_mode (MmapMode | None): The mode the transitions are memory-mapped with, or None to read them into memory
+        Returns:
+            DeterministicAutomata: The loaded automata, a DeterministicTrasducer if a transducer was saved
+        Raises:
+            ValueError: If mmap_mode is not a supported mode
+            TableFormatException: If the directory does not hold an automata that can be loaded as this class
+
+        The delta function of the loaded automata looks up the transitions in the table, as
+        with from_table. With the default mmap_mode, processes loading the same automata share
+        the memory of its transitions.
+        """
+        table, header = load_table(path, mmap_mode)
 
-        # Process each symbol in tape
-        for symbol in tape:
-            currentState = call_func_iterable(self.delta, currentState, symbol)[0]
-            currentState = (
-                tuple(currentState) if isinstance(currentState, list) else currentState
+        if header["kind"] == "transducer":
+            return DeterministicTrasducer.from_table(table, header["output_alphabet"])
+        if header["kind"] != "deterministic" or issubclass(cls, DeterministicTrasducer):
+            raise TableFormatException(
+                path, f"a {header['kind']} table can't be loaded as {cls.__name__}"
             )
+        return cls.from_table(table)
 
-        # Check if final state
-        return currentState in self.final_states
+    def intersection(
+        self, other: "DeterministicAutomata", minimize: bool = False
+    ) -> "DeterministicAutomata":
+        """
+        Create an automata accepting the inputs accepted by both automata.
+
+        Args:
+            other (DeterministicAutomata): The other automata, with the same alphabet
+            minimize (bool): Whether to minimize the resulting automata
+        Returns:
+            DeterministicAutomata: The product automata, whose states are pairs of states of both automata
+        Raises:
+            AlphabetMismatchException: If the automata do not have the same alphabet
+
+        The product is built from the transition tables of both automata, only creating the
+        pairs of states reachable from the initial states. It can also be written as a & b.
+        """
+        return self._product(other, np.logical_and, minimize)
+
+    def union(
+        self, other: "DeterministicAutomata", minimize: bool = False
+    ) -> "DeterministicAutomata":
+        """
+        Create an automata accepting the inputs accepted by either automata.
+
+        See intersection for the arguments. It can also be written as a | b.
+        """
+        return self._product(other, np.logical_or, minimize)
+
+    def difference(
+        self, other: "DeterministicAutomata", minimize: bool = False
+    ) -> "DeterministicAutomata":
+        """
+        Create an automata accepting the inputs accepted by this automata but not the other one.
+
+        See intersection for the arguments. It can also be written as a - b.
+        """
+        return self._product(other, lambda first, second: first & ~second, minimize)
+
+    def complement(self, minimize: bool = False) -> "DeterministicAutomata":
+        """
+        Create an automata accepting the inputs over the alphabet not accepted by this one.
+
+        Args:
+            minimize (bool): Whether to minimize the resulting automata
+        Returns:
+            DeterministicAutomata: An automata with the same states, and every final state swapped
+
+        It can also be written as ~a.
+        """
+        table = self.table.complement()
+        return DeterministicAutomata.from_table(table.minimize() if minimize else table)
+
+    def _product(
+        self, other: "DeterministicAutomata", accept: Any, minimize: bool
+    ) -> "DeterministicAutomata":
+        table = self.table.product(other.table, accept)
+        return DeterministicAutomata.from_table(table.minimize() if minimize else table)
+
+    def __and__(self, other: "DeterministicAutomata") -> "DeterministicAutomata":
+        return self.intersection(other)
+
+    def __or__(self, other: "DeterministicAutomata") -> "DeterministicAutomata":
+        return self.union(other)
+
+    def __sub__(self, other: "DeterministicAutomata") -> "DeterministicAutomata":
+        return self.difference(other)
+
+    def __invert__(self) -> "DeterministicAutomata":
+        return self.complement()
+
+    def is_empty(self) -> bool:
+        """
+        Check if the automata accepts no input at all.
+
+        Returns:
+            bool: True if no final state is reachable from the initial state, False otherwise
+        """
+        return self.table.is_empty()
+
+    def issubset(self, other: "DeterministicAutomata") -> bool:
+        """
+        Check if every input accepted by this automata is accepted by the other one.
+
+        Args:
+            other (DeterministicAutomata): The other automata, with the same alphabet
+        Returns:
+            bool: True if the inputs accepted by this automata are a subset of the ones accepted by the other one
+        Raises:
+            AlphabetMismatchException: If the automata do not have the same alphabet
+
+        The check is done by checking that the difference of both automata is empty, without
+        running any input.
+        """
+        return self.difference(other).is_empty()
+
+    def is_equivalent(self, other: "DeterministicAutomata") -> bool:
+        """
+        Check if both automata accept exactly the same inputs.
+
+        See issubset for the arguments.
+        """
+        return self.table.product(other.table, np.logical_xor).is_empty()
+
+    def minimize(self) -> "DeterministicAutomata":
+        """
+        Create the minimal deterministic automata equivalent to this one.
+
+        Returns:
+            DeterministicAutomata: An automata accepting the same inputs, without unreachable states and with equivalent states merged
+
+        Equivalent states are merged with Hopcroft's partition refinement algorithm over the
+        transition table. Each merged state is represented by one of the states it contains.
+        """
+        return DeterministicAutomata.from_table(self.table.minimize())
+
+    def _build_network(self) -> nx.DiGraph:
+        # Group the symbols of every pair of states connected in the compiled table
+        edge_map = defaultdict(list)
+        for state, row in enumerate(self.table.transitions.tolist()):
+            for symbol, nextState in zip(self.table.symbols, row):
+                edge_map[state, nextState].append(str(symbol))
+
+        # Create network, labeling each edge with a comma-separated list of symbols
+        network = nx.DiGraph()
+        network.add_nodes_from([str(state) for state in self.table.states])
+        network.add_edges_from(
+            (
+                str(self.table.states[state]),
+                str(self.table.states[nextState]),
+                {"label": ", ".join(symbols)},
+            )
+            for (state, nextState), symbols in edge_map.items()
+        )
+        return network
+
+    def accepts_input(self, tape: Tape) -> bool:
+        # Process each symbol in tape through the compiled table
+        return self.table.is_final(self.table.run(tape))
+
+    def accepts_many(self, tapes: Iterable[Tape]) -> np.ndarray:
+        """
+        Check if the automata accepts each of the given inputs.
+
+        Args:
+            tapes (Iterable[Tape]): The inputs to check, each a string, a bytes-like tape or a sequence of symbols
+        Returns:
+            np.ndarray: A boolean array, True for each input accepted by the automata
+
+        The inputs are processed together as a batch over the transition table, which is
+        much faster than calling accepts_input for each one when there are many short inputs.
+        """
+        return self.table.final[self.table.run_many(tapes)]
+
+    def finditer(self, tape: Any) -> Iterator[Tuple[int, int]]:
+        """
+        Find the matches of the automata inside a text.
+
+        Args:
+            tape (Any): The text to search, bytes-like tapes are read as byte values, or as latin-1 characters if every symbol is a single character
+        Returns:
+            Iterator[Tuple[int, int]]: The start and end of each match, so that tape[start:end] is accepted by the automata
+
+        Matches are leftmost-longest and don't overlap: each match is the longest one starting
+        at the first position where one starts, after the end of the previous match. Empty
+        matches are not returned. The text is scanned in a single pass, see the scan module.
+        """
+        if self._scanner is None:
+            self._scanner = Scanner(self.table)
+        for start, end, _ in self._scanner.scan(tape):
+            yield start, end
+
+    def runner(self) -> "DeterministicRunner":
+        """
+        Create a runner that processes the input of this automata incrementally.
+
+        Returns:
+            DeterministicRunner: A runner starting on the initial state
+        """
+        return DeterministicRunner(self)
 
 
 class DeterministicTrasducer(DeterministicAutomata):
@@ -109,6 +356,8 @@ class DeterministicTrasducer(DeterministicAutomata):
         final_states (Tuple | List): An iterable containing all final states of the transducer
         delta (Function): A function that takes as input a state and a symbol and returns the next state of the transducer
         transfunc (Function): A function that takes as input a state and a symbol and returns the output of the transducer
+        reachable (bool): Whether to only compile the states reachable from the initial state
+        workers (int | None): The number of processes calling the delta and transducer functions when the transducer is created
 
     The delta and transfunc functions will usually be decorated with the deltafunc and transducerfunc decorators from the delta module.
     """
@@ -122,43 +371,158 @@ class DeterministicTrasducer(DeterministicAutomata):
         final_states: Tuple | List,
         delta: Function,
         transfunc: Function,
+        reachable: bool = False,
+        workers: int | None = None,
     ) -> None:
         # Initialize parent class
-        super().__init__(states, alphabet, initial_state, final_states, delta)
+        super().__init__(
+            states, alphabet, initial_state, final_states, delta, reachable, workers
+        )
 
         # Set output alphabet and transducer function
         self.output_alphabet = set(output_alphabet)
         self.transfunc = transfunc
 
-    def get_output(self, tape: str) -> tuple[str, bool]:
+        # Compile the output of every transition next to the transition table,
+        # verifying that every output belongs to the output alphabet
+        self.table.compile_outputs(transfunc, self.output_alphabet, workers)
+
+    @classmethod
+    def from_table(
+        cls, table: TransitionTable, output_alphabet: Iterable | None = None
+    ) -> "DeterministicTrasducer":
+        """
+        Create a deterministic transducer from an already compiled transition table.
+
+        Args:
+            table (TransitionTable): The compiled transitions of the transducer, including their outputs
+            output_alphabet (Iterable | None): The output alphabet, by default every symbol found in the outputs
+        Returns:
+            DeterministicTrasducer: A transducer running over the given table
+        Raises:
+            ValueError: If the table has no outputs
+        """
+        if table.outputs is None:
+            raise ValueError("The table of a transducer must have outputs")
+
+        transducer = cls.__new__(cls)
+        transducer._init_from_table(table)
+        if output_alphabet is None:
+            output_alphabet = set(
+                symbol for row in table.outputs for output in row for symbol in output
+            )
+        transducer.output_alphabet = set(output_alphabet)
+        transducer.transfunc = TableOutput(table)
+        return transducer
+
+    def save(self, path: str | os.PathLike) -> None:
+        self.table.save(path, kind="transducer", output_alphabet=self.output_alphabet)
+
+    def get_output(self, tape: Tape, writer: TextIO | None = None) -> tuple[str, bool]:
         """
         Get the output of the transducer for the given input.
 
         Args:
-            tape (str): The input tape
+            tape (Tape): The input tape, bytes-like tapes are read as byte values
+            writer (TextIO | None): A file-like object the output is written to as the input is processed
         Returns:
             tuple[str, bool]: A tuple containing the output tape and a boolean representing whether the transducer accepts the input
 
-        If the transducer does not accept the input, the output tape will be an empty string.
+        If a writer is given, the output is written to it instead, and the output tape returned will be an empty string.
         """
-        self._input_allowed(tape)
+        # Process each symbol in tape, looking up the next state and output of each transition
+        outputs, finalState = self.table.transduce(
+            tape, write=writer.write if writer is not None else None
+        )
 
-        outputTape = ""
-        currentState = self.initial_state
+        # Check if final state
+        return "".join(outputs), self.table.is_final(finalState)
 
-        # Process each symbol in tape, applying transducer function to each symbol
-        for symbol in tape:
-            outputTape += call_func_iterable(self.transfunc, currentState, symbol)[0]
-            currentState = call_func_iterable(self.delta, currentState, symbol)[0]
-            currentState = (
-                tuple(currentState) if isinstance(currentState, list) else currentState
-            )
+    def runner(self) -> "TransducerRunner":
+        """
+        Create a runner that processes the input of this transducer incrementally.
 
-        # Verify that all output symbols are in output alphabet
-        if not set(outputTape).issubset(self.output_alphabet):
-            raise OutputSymbolNotFoundException(
-                self.output_alphabet.difference(outputTape)
-            )
+        Returns:
+            TransducerRunner: A runner starting on the initial state
+        """
+        return TransducerRunner(self)
 
-        # Check if final state
-        return outputTape, currentState in self.final_states
+
+class DeterministicRunner:
+    """
+    Class for running a deterministic automata over an input given in chunks.
+
+    The runner keeps the current state of the automata between calls to feed, so inputs
+    that do not fit in memory, such as streams, can be processed one chunk at a time.
+
+    Args:
+        automata (DeterministicAutomata): The automata to run
+    """
+
+    def __init__(self, automata: DeterministicAutomata) -> None:
+        self.automata = automata
+        self._table = automata.table
+        self._state = self._table.initial
+
+    def feed(self, chunk: Tape) -> None:
+        """
+        Process the next chunk of the input.
+
+        Args:
+            chunk (Tape): The symbols to process
+        Raises:
+            SymbolNotFoundException: If a symbol is not part of the alphabet, in which case the state is left unchanged
+        """
+        self._state = self._table.run(chunk, self._state)
+
+    @property
+    def state(self) -> Any:
+        """
+        The current state of the automata
+        """
+        return self._table.states[self._state]
+
+    def is_accepting(self) -> bool:
+        """
+        Check if the input processed so far is accepted by the automata.
+
+        Returns:
+            bool: True if the current state is a final state, False otherwise
+        """
+        return self._table.is_final(self._state)
+
+    def reset(self) -> None:
+        """
+        Return to the initial state, discarding the input processed so far.
+        """
+        self._state = self._table.initial
+
+
+class TransducerRunner(DeterministicRunner):
+    """
+    Class for running a deterministic transducer over an input given in chunks.
+
+    Args:
+        automata (DeterministicTrasducer): The transducer to run
+    """
+
+    automata: DeterministicTrasducer
+
+    def __init__(self, automata: DeterministicTrasducer) -> None:
+        super().__init__(automata)
+
+    def transduce(self, chunk: Tape) -> str:
+        """
+        Process the next chunk of the input, returning the output of the transducer for it.
+
+        Args:
+            chunk (Tape): The symbols to process
+        Returns:
+            str: The output of the transducer for the chunk
+        Raises:
+            SymbolNotFoundException: If a symbol is not part of the alphabet, in which case the state is left unchanged
+
+        Chunks processed with feed advance the transducer the same way, discarding their output.
+        """
+        outputs, self._state = self._table.transduce(chunk, self._state)
+        return "".join(outputs)
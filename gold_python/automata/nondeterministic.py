@@ -4,42 +4,22 @@ This module defines a non-deterministic automata class.
 Unlike the deterministic automata class, a non-deterministic automata can have multiple transitions for a given state and symbol. This is represented by a set of next states for each state and symbol. It also has a lambda transition, which is represented by an empty string as the symbol in the delta function.
 """
 
-from collections import defaultdict, deque
-from typing import Iterable, Any, Tuple, List
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, Any, Tuple, List, Set
+import networkx as nx
 
-from anytree import Node
-
-from gold_python.automata.deterministic import Function
+from gold_python.automata.deterministic import DeterministicAutomata, Function
+from gold_python.automata.table import TransitionTable
 from gold_python.util import call_func_iterable
-from gold_python.exceptions import StateNotFoundException
-from gold_python.automata.abstract import AbstractNonDeterministicAutomata
-from gold_python.automata.util import Task
-
-
-class _Queue:
-    def __init__(self, len=None):
-        self.queue = deque(maxlen=len)
-
-    def enqueue(self, item):
-        self.queue.append(item)
-
-    def dequeue(self):
-        if self.queue:
-            return self.queue.popleft()
-        else:
-            return None  # Return None when the queue is empty
-
-    def peek(self):
-        if self.queue:
-            return self.queue[0]
-        else:
-            return None  # Return None when the queue is empty
-
-    def __len__(self):
-        return len(self.queue)
+from gold_python.exceptions import StateNotFoundException, SymbolNotFoundException
+from gold_python.automata.abstract import (
+    AbstractAutomata,
+    AbstractNonDeterministicAutomata,
+)
+from gold_python.automata.parallel import explore_parallel
+from gold_python.automata.util import StateInterner, Task, _Queue
 
 
-# TODO: Re-implement multi-core support. Current implementation is cleaner, but slower.
 class NonDeterministicAutomata(AbstractNonDeterministicAutomata):
     def __init__(
         self,
@@ -51,24 +31,184 @@ class NonDeterministicAutomata(AbstractNonDeterministicAutomata):
     ) -> None:
         super().__init__(states, alphabet, initial_state, final_states, delta)
 
-        # Map to store edges between states
-        edge_map = defaultdict(list)
+        # Transitions found for every state and symbol, including lambda transitions
+        self.transitions: Dict[Tuple[Any, str], FrozenSet] = {}
+
+        # The set engine and determinization work on states interned into integers, with
+        # the transitions and lambda closures between them found on demand
+        self._interner = StateInterner()
+        self._initial_id = self._interner.intern(self.initial_state)
+        self._final_ids = self._interner.intern_all(self.final_states)
+        self._id_transitions: Dict[Tuple[int, str], FrozenSet[int]] = {}
+        self._closures: Dict[int, FrozenSet[int]] = {}
 
-        # Iterate through all states and symbols to create edges
+        # Iterate through all states and symbols to find their transitions
         for state in self.states:
             for symbol in self.alphabet:
-                nextStates = set(call_func_iterable(self.delta, state, symbol))
+                nextStates = frozenset(call_func_iterable(self.delta, state, symbol))
 
-                if not nextStates.issubset(self.states):
+                # Compared against the states, so state spaces are not materialized
+                if not nextStates <= self.states:
                     raise StateNotFoundException(symbol, state, nextStates)
 
-                for nextState in nextStates:
-                    edge_map[str(state), str(nextState)].append(symbol)
-                    symbol_list = ", ".join(edge_map[str(state), str(nextState)])
-                    self.network.add_edge(str(state), str(nextState), label=symbol_list)
+                self.transitions[state, symbol] = nextStates
 
-    def accepts_input(self, tape: str) -> bool:
-        return self.accepts_input_path(tape)[0]
+    def _build_network(self) -> nx.DiGraph:
+        # Group the symbols of every pair of states connected by a transition
+        edge_map = defaultdict(list)
+        for (state, symbol), nextStates in self.transitions.items():
+            if symbol not in self.alphabet:
+                continue
+            for nextState in nextStates:
+                edge_map[str(state), str(nextState)].append(str(symbol))
+
+        # Create network, labeling each edge with a comma-separated list of symbols
+        network = super()._build_network()
+        network.add_edges_from(
+            (state, nextState, {"label": ", ".join(symbols)})
+            for (state, nextState), symbols in edge_map.items()
+        )
+        return network
+
+    def accepts_input(
+        self, tape: str, engine: str = "set", workers: int | None = None
+    ) -> bool:
+        """
+        Check if the automata accepts the given input.
+
+        Args:
+            tape (str): The input string to check
+            engine (str): The engine used to explore the automata, either "set" or "tree"
+            workers (int | None): The number of processes used by the "tree" engine
+        Returns:
+            bool: True if the automata accepts the input, False otherwise
+
+        The "set" engine keeps track of the set of states the automata can be in after each
+        symbol, so the work done is bounded by the length of the input times the number of
+        states. The "tree" engine explores every path separately, as accepts_input_path does,
+        without keeping track of the path taken. When workers is given, the paths are
+        explored by that many processes, see the parallel module.
+        """
+        if engine == "set":
+            if workers is not None:
+                raise ValueError("Workers can only be used with the 'tree' engine")
+            return self._accepts_input_set(tape)
+        elif engine == "tree":
+            if workers is not None:
+                return explore_parallel(self, tape, workers)
+            return self._explore(tape, False)[0]
+        raise ValueError(f"Unknown engine {engine}, expected 'set' or 'tree'")
+
+    def _accepts_input_set(self, tape: str) -> bool:
+        self._input_allowed(tape)
+        currentStates = frozenset([self._initial_id])
+
+        # Advance the whole set of current states one symbol at a time
+        for symbol in tape:
+            currentStates = self._step(currentStates, symbol)
+            if not currentStates:
+                return False
+
+        return not currentStates.isdisjoint(self._final_ids)
+
+    def determinize(self) -> DeterministicAutomata:
+        """
+        Convert this automata into an equivalent deterministic automata.
+
+        Returns:
+            DeterministicAutomata: A deterministic automata accepting the same inputs
+
+        The conversion is done through subset construction, only creating the sets of states
+        reachable from the initial state. The states of the deterministic automata are
+        frozensets of states of this automata. As in accepts_input, lambda transitions are
+        taken before reading each symbol of the input.
+        """
+        symbols = list(self.alphabet)
+        initial = frozenset([self._initial_id])
+        subsets = [initial]
+        subset_index = {initial: 0}
+        transitions = []
+
+        # Breadth-first search over the sets of states reachable from the initial state
+        for subset in subsets:
+            row = []
+            for symbol in symbols:
+                nextSubset = self._step(subset, symbol)
+                if nextSubset not in subset_index:
+                    subset_index[nextSubset] = len(subsets)
+                    subsets.append(nextSubset)
+                row.append(subset_index[nextSubset])
+            transitions.append(row)
+
+        final = [not subset.isdisjoint(self._final_ids) for subset in subsets]
+        states = [self._states_of(subset) for subset in subsets]
+        table = TransitionTable(states, symbols, transitions, 0, final)
+        return DeterministicAutomata.from_table(table)
+
+    def lazy_determinize(self, max_states: int = 10000) -> "LazyDeterministicAutomata":
+        """
+        Create a deterministic view of this automata that is built while inputs are processed.
+
+        Args:
+            max_states (int): The maximum number of sets of states to keep cached
+        Returns:
+            LazyDeterministicAutomata: A deterministic automata accepting the same inputs
+        Raises:
+            ValueError: If max_states is lower than 1
+
+        Unlike determinize, only the sets of states visited by the inputs are created.
+        """
+        return LazyDeterministicAutomata(self, max_states)
+
+    def _successors(self, id: int, symbol: str) -> FrozenSet[int]:
+        nextIds = self._id_transitions.get((id, symbol))
+        if nextIds is not None:
+            return nextIds
+
+        # Transitions are looked up from the ones found on creation, lambda transitions
+        # and transitions from states outside of the set of states are found on demand
+        state = self._interner.state(id)
+        nextStates = self.transitions.get((state, symbol))
+        if nextStates is None:
+            nextStates = frozenset(call_func_iterable(self.delta, state, symbol))
+            self.transitions[state, symbol] = nextStates
+
+        nextIds = self._id_transitions[id, symbol] = self._interner.intern_all(
+            nextStates
+        )
+        return nextIds
+
+    def _states_of(self, ids: Iterable[int]) -> FrozenSet:
+        # Convert a set of interned states back into the states themselves
+        return frozenset([self._interner.state(id) for id in ids])
+
+    def _lambda_closure(self, ids: Iterable[int]) -> FrozenSet[int]:
+        return frozenset().union(*[self._state_closure(id) for id in ids])
+
+    def _state_closure(self, id: int) -> FrozenSet[int]:
+        # The lambda closure of each state is computed once and reused afterwards
+        closure = self._closures.get(id)
+        if closure is not None:
+            return closure
+
+        reached = {id}
+        pending = [id]
+        while pending:
+            for nextId in self._successors(pending.pop(), ""):
+                if nextId not in reached:
+                    reached.add(nextId)
+                    pending.append(nextId)
+
+        closure = self._closures[id] = frozenset(reached)
+        return closure
+
+    def _step(self, ids: FrozenSet[int], symbol: str) -> FrozenSet[int]:
+        # Take the lambda transitions before reading the symbol, as accepts_input_path does
+        return frozenset(
+            nextId
+            for id in self._lambda_closure(ids)
+            for nextId in self._successors(id, symbol)
+        )
 
     def accepts_input_path(self, tape: str) -> Tuple[bool, List]:
         """
@@ -80,20 +220,23 @@ class NonDeterministicAutomata(AbstractNonDeterministicAutomata):
             Tuple[bool, List]: A tuple containing a boolean representing if the automata accepts the input, and a list containing the path taken by the automata if it accepts the input.
 
         This is a separate method from accepts_input, since it returns the path taken by the automata if it accepts the input.
+        The path is a list of (state, tape) tuples, starting from the final state and ending on the initial state.
         """
+        return self._explore(tape, True)
+
+    def _explore(self, tape: str, trace: bool) -> Tuple[bool, List]:
         if len(tape) == 0:
             return self.initial_state in self.final_states, []
 
         # Create queue for tasks and a return queue to check if a path has been found
 
-        queue: _Queue = _Queue()
+        queue: _Queue = self._new_queue()
         return_queue: _Queue = _Queue(1)
 
         self._input_allowed(tape)
 
-        # Create root node, and add tasks to queue
-        root = Node((self.initial_state, tape))
-        self._prepare_queue(root, tape, queue)
+        # Add initial tasks to queue
+        self._prepare_queue(tape, queue)
 
         # Main loop to process tasks
         while True:
@@ -105,45 +248,48 @@ class NonDeterministicAutomata(AbstractNonDeterministicAutomata):
             if task is None:
                 break
 
-            self._run_task(task, queue, return_queue)
+            self._run_task(task, queue, return_queue, trace)
 
         # Check if path has been found, and construct path if it has
         if return_queue.peek() is not None:
             final_state: Task = return_queue.dequeue()
-            path = [(final_state.state, final_state.tape)] + [
-                node.name for node in final_state.node.iter_path_reverse()
-            ]
+            path = [(task.state, task.tape) for task in final_state.iter_path_reverse()]
             return True, path
         else:
             return False, []
 
-    def _prepare_queue(self, root: Node, tape: str, queue: _Queue):
-        # Add initial tasks to queue, including lambda transitions
-        queue.enqueue(Task(self.initial_state, tape, tape[0], root))
-        queue.enqueue(Task(self.initial_state, tape, "", root))
+    def _new_queue(self) -> _Queue:
+        return _Queue()
 
-    def _insert_node(self, state: Any, parent: Node, next: str):
-        # Insert node into tree using lock, and return node
-        display_text = f"{state}, {next}" if next != "" else f"{state}, λ"
-        with self.lock:
-            node = Node(display_text, parent=parent)
-        return node
+    def _prepare_queue(self, tape: str, queue: _Queue):
+        # Add initial tasks to queue, including lambda transitions
+        queue.enqueue(Task(self.initial_state, tape, tape[0]))
+        queue.enqueue(Task(self.initial_state, tape, ""))
 
     def _run_task(
         self,
         task: Task,
         queue: _Queue,
         return_queue: _Queue,
+        trace: bool = True,
+        visited: Set[Tuple] | None = None,
     ) -> None:
-        # Insert node into tree, if empty transition, insert lambda symbol
-        node = self._insert_node((task.state, task.tape), task.node, task.next)
-
         # Finish task if tape is empty, and add to return queue if final state
         if len(task.tape) == 0:
             if task.state in self.final_states:
                 return_queue.enqueue(task)
             return
 
+        # Skip configurations that have already been explored, when they are tracked
+        if visited is not None:
+            configuration = task.configuration()
+            if configuration in visited:
+                return
+            visited.add(configuration)
+
+        # Only keep a pointer to the parent task when the path has been requested
+        parent = task if trace else None
+
         # Exception handling is done in delta function, so no need to check for exceptions here
         nextStates = call_func_iterable(self.delta, task.state, task.next)
 
@@ -153,14 +299,84 @@ class NonDeterministicAutomata(AbstractNonDeterministicAutomata):
                 # If empty transition, don't add lambda transition, to avoid infinite loops
                 if task.state == state:
                     continue
-                continue_task = Task(state, task.tape, task.tape[0], node)
-                lambda_task = Task(state, task.tape, "", node)
+                continue_task = Task(state, task.tape, task.tape[0], parent)
+                lambda_task = Task(state, task.tape, "", parent)
             else:
                 next_symbol = "" if len(task.tape) == 1 else task.tape[1]
                 next_tape = task.tape[1:]
 
-                continue_task = Task(state, next_tape, next_symbol, node)
-                lambda_task = Task(state, next_tape, "", node)
+                continue_task = Task(state, next_tape, next_symbol, parent)
+                lambda_task = Task(state, next_tape, "", parent)
 
             queue.enqueue(continue_task)
             queue.enqueue(lambda_task)
+
+
+class LazyDeterministicAutomata(AbstractAutomata):
+    """
+    Class for a deterministic automata built on demand from a non-deterministic automata.
+
+    The states of this automata are sets of states of the non-deterministic automata, interned
+    into integers, which are only created the first time an input reaches them. Created states and their
+    transitions are cached across calls, up to max_states, after which the oldest states
+    are evicted from the cache.
+
+    The cap only covers the cached states of this automata. The non-deterministic automata
+    keeps its own memo of interned states, lambda closures and transitions, which is not
+    evicted: it grows with the states of the non-deterministic automata reached by the
+    inputs, instead of with the sets of them, and lasts as long as that automata.
+
+    Args:
+        automata (NonDeterministicAutomata): The automata to determinize
+        max_states (int): The maximum number of states to keep cached
+    Raises:
+        ValueError: If max_states is lower than 1
+    """
+
+    def __init__(self, automata: NonDeterministicAutomata, max_states: int = 10000):
+        super().__init__(
+            automata.states,
+            automata.alphabet,
+            automata.initial_state,
+            list(automata.final_states),
+            automata.delta,
+        )
+        if max_states < 1:
+            raise ValueError(
+                f"The maximum number of states must be at least 1, got {max_states}"
+            )
+
+        self.automata = automata
+        self.max_states = max_states
+        self._initial = frozenset([automata._initial_id])
+        self._cache: Dict[FrozenSet, Dict[str, FrozenSet]] = {}
+
+    def accepts_input(self, tape: str) -> bool:
+        cache = self._cache
+        subset = self._initial
+
+        for symbol in tape:
+            row = cache.get(subset)
+            if row is None:
+                row = self._add_state(subset)
+
+            nextSubset = row.get(symbol)
+            if nextSubset is None:
+                if symbol not in self.alphabet:
+                    raise SymbolNotFoundException(symbol)
+                nextSubset = row[symbol] = self.automata._step(subset, symbol)
+            subset = nextSubset
+
+        return not subset.isdisjoint(self.automata._final_ids)
+
+    def _add_state(self, subset: FrozenSet) -> Dict[str, FrozenSet]:
+        # Evict the oldest cached state once the cache is full
+        if len(self._cache) >= self.max_states:
+            del self._cache[next(iter(self._cache))]
+
+        row: Dict[str, FrozenSet] = {}
+        self._cache[subset] = row
+        return row
+
+    def __len__(self) -> int:
+        return len(self._cache)
@@ -0,0 +1,269 @@
+"""
+This module explores non-deterministic automata with several processes.
+
+The configurations waiting to be explored are kept in a frontier by the calling process,
+which hands them out in batches to a pool of worker processes. Each worker explores its batch
+for a bounded number of steps, and returns the configurations it did not get to, so they can
+be handed out again to whichever worker is free first. Once a worker finds an accepting
+configuration, every other worker is told to stop through a shared event.
+
+Configurations are sent between processes as tuples holding the position on the tape
+instead of the rest of the tape, and the tape is only sent once to every worker. Workers
+are started as described by _pool_context in the util module.
+
+The module also contains run_corpus, which runs an automata over a large number of inputs
+by sending chunks of them to a pool of worker processes.
+"""
+
+import os
+import pickle
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Set, Tuple, Type
+
+from gold_python.automata.deterministic import (
+    DeterministicAutomata,
+    DeterministicTrasducer,
+)
+from gold_python.automata.util import Task, _Queue, _pool_context
+
+BATCH_SIZE = 256
+"""The maximum number of configurations sent to a worker at once"""
+
+BATCH_STEPS = 4096
+"""The number of tasks a worker runs before returning the rest of its batch"""
+
+STOP_CHECK_INTERVAL = 256
+"""The number of tasks a worker runs between checks of the stop event"""
+
+# State of each worker process, set once when the worker starts
+_worker: dict = {}
+
+
+def _init_worker(automata: Any, tape: str, task_class: Type[Task], stop: Any) -> None:
+    _worker["automata"] = automata
+    _worker["tape"] = tape
+    _worker["task_class"] = task_class
+    _worker["stop"] = stop
+
+
+def _explore_batch(configurations: List[Tuple], steps: int) -> Tuple[bool, List]:
+    automata = _worker["automata"]
+    tape = _worker["tape"]
+    task_class = _worker["task_class"]
+    stop = _worker["stop"]
+
+    queue: _Queue = automata._new_queue()
+    return_queue: _Queue = _Queue(1)
+    visited: Set[Tuple] = set()
+
+    # Enqueue the configurations furthest from the end of the tape first, as the queue
+    # of the automata may rely on tasks being enqueued in order
+    for configuration in sorted(configurations, key=lambda c: -c[1]):
+        queue.enqueue(task_class.from_configuration(tape, configuration))
+
+    for step in range(steps):
+        if step % STOP_CHECK_INTERVAL == 0 and stop.is_set():
+            return False, []
+
+        task = queue.dequeue()
+        if task is None:
+            break
+
+        automata._run_task(task, queue, return_queue, False, visited)
+        if return_queue.peek() is not None:
+            stop.set()
+            return True, []
+
+    return False, [task.configuration() for task in queue]
+
+
+def explore_parallel(automata: Any, tape: str, workers: int) -> bool:
+    """
+    Check if a non-deterministic automata accepts the given input, using several processes.
+
+    Args:
+        automata (AbstractNonDeterministicAutomata): The automata to run
+        tape (str): The input string to check
+        workers (int): The number of worker processes
+    Returns:
+        bool: True if the automata accepts the input, False otherwise
+    Raises:
+        ValueError: If the number of workers is lower than 1
+
+    The calling process only hands out configurations it has not handed out before, unless
+    the worker that received them did not get to explore them. Workers only remember the
+    configurations they explored during their current batch though, so a configuration
+    reached by several batches may be explored by each of them.
+    """
+    if workers < 1:
+        raise ValueError(f"The number of workers must be at least 1, got {workers}")
+
+    if len(tape) == 0:
+        return automata.initial_state in automata.final_states
+    automata._input_allowed(tape)
+
+    # Build the initial configurations the same way the sequential search does
+    initial: _Queue = _Queue()
+    automata._prepare_queue(tape, initial)
+    task_class = type(initial.peek())
+
+    frontier: Deque[Tuple] = deque()
+    seen: Set[Tuple] = set()
+    for task in initial:
+        configuration = task.configuration()
+        if configuration not in seen:
+            seen.add(configuration)
+            frontier.append(configuration)
+
+    context = _pool_context()
+    stop = context.Event()
+    pending: Set[Future] = set()
+    batches: Dict[Future, Set[Tuple]] = {}
+
+    with ProcessPoolExecutor(
+        workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(automata, tape, task_class, stop),
+    ) as pool:
+        try:
+            while frontier or pending:
+                # Split the frontier between the free slots, keeping every worker busy
+                while frontier and len(pending) < 2 * workers:
+                    size = -(-len(frontier) // (2 * workers - len(pending)))
+                    batch = [frontier.popleft() for _ in range(min(size, BATCH_SIZE))]
+                    future = pool.submit(_explore_batch, batch, BATCH_STEPS)
+                    batches[future] = set(batch)
+                    pending.add(future)
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    accepted, leftovers = future.result()
+                    if accepted:
+                        return True
+
+                    # Configurations of the batch the worker did not get to are handed
+                    # out again, new ones only if no other worker has received them
+                    sent = batches.pop(future)
+                    for configuration in leftovers:
+                        if configuration in sent:
+                            frontier.append(configuration)
+                        elif configuration not in seen:
+                            seen.add(configuration)
+                            frontier.append(configuration)
+        finally:
+            # Stop the running batches and drop the ones that have not started
+            stop.set()
+            for future in pending:
+                future.cancel()
+
+    return False
+
+
+def _init_corpus_worker(automata: Any) -> None:
+    # The automata is given pickled when the workers are not forked
+    if isinstance(automata, bytes):
+        automata = pickle.loads(automata)
+    _worker["automata"] = automata
+
+
+def _run_chunk(tapes: List) -> List:
+    automata = _worker["automata"]
+
+    if isinstance(automata, DeterministicTrasducer):
+        return [automata.get_output(tape) for tape in tapes]
+    if isinstance(automata, DeterministicAutomata):
+        return automata.accepts_many(tapes).tolist()
+    return [automata.accepts_input(tape) for tape in tapes]
+
+
+def _read_lines(path: str | os.PathLike, encoding: str) -> Iterator[str]:
+    with open(path, encoding=encoding) as file:
+        for line in file:
+            yield line.rstrip("\r\n")
+
+
+def run_corpus(
+    automata: Any,
+    tapes: Iterable | str | os.PathLike,
+    workers: int | None = None,
+    chunksize: int = 1024,
+    ordered: bool = True,
+    encoding: str = "utf-8",
+) -> Iterator:
+    """
+    Run an automata over every input of a corpus, using several processes.
+
+    Args:
+        automata (AbstractAutomata): The automata to run
+        tapes (Iterable | str | os.PathLike): The inputs, or the path of a text file with an input on each line
+        workers (int | None): The number of worker processes, by default the number of CPUs
+        chunksize (int): The number of inputs sent to a worker at once
+        ordered (bool): Whether the results are returned in the order of the inputs
+        encoding (str): The encoding of the file, if a path is given
+    Returns:
+        Iterator: The result of each input, or (index, result) tuples if ordered is False
+    Raises:
+        ValueError: If the number of workers or the chunk size is lower than 1
+
+    The result of an input is the one of get_output for transducers, and the one of
+    accepts_input for every other automata. Deterministic automata run each chunk through
+    accepts_many.
+
+    The inputs are read as the results are consumed, with at most two chunks per worker
+    waiting to be processed, so the corpus never has to fit in memory. Unordered results
+    are returned as soon as their chunk is done, with the index of their input.
+
+    The automata is sent once to each worker, which are started as described by
+    _pool_context in the util module.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"The number of workers must be at least 1, got {workers}")
+    if chunksize < 1:
+        raise ValueError(f"The chunk size must be at least 1, got {chunksize}")
+
+    if isinstance(tapes, (str, os.PathLike)):
+        tapes = _read_lines(tapes, encoding)
+    tapes = iter(tapes)
+
+    context = _pool_context()
+    if context.get_start_method() != "fork":
+        automata = pickle.dumps(automata)
+
+    pool = ProcessPoolExecutor(
+        workers,
+        mp_context=context,
+        initializer=_init_corpus_worker,
+        initargs=(automata,),
+    )
+    pending: Deque[Tuple[int, Future]] = deque()
+    start = 0
+
+    try:
+        while True:
+            # Keep every worker busy without reading the whole corpus
+            while len(pending) < 2 * workers:
+                chunk = list(islice(tapes, chunksize))
+                if not chunk:
+                    break
+                pending.append((start, pool.submit(_run_chunk, chunk)))
+                start += len(chunk)
+
+            if not pending:
+                break
+
+            if ordered:
+                yield from pending.popleft()[1].result()
+                continue
+
+            wait([future for _, future in pending], return_when=FIRST_COMPLETED)
+            for index, future in [item for item in pending if item[1].done()]:
+                pending.remove((index, future))
+                yield from enumerate(future.result(), index)
+    finally:
+        # Drop the chunks that have not started if the results are no longer needed
+        pool.shutdown(wait=True, cancel_futures=True)
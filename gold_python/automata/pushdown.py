@@ -9,16 +9,14 @@ will throw an exception if the wrong symbol is popped. Adittionally, the stack
 must be empty for the automata to accept the input.
 """
 
-from copy import deepcopy
-from typing import Iterable, Tuple, Any, List, Callable
-
-from anytree import Node
+from collections import defaultdict, deque
+from typing import Dict, FrozenSet, Iterable, Tuple, Any, List, Callable, Set
 
 from gold_python.automata.abstract import AbstractNonDeterministicAutomata
-from gold_python.automata.nondeterministic import _Queue
+from gold_python.automata.parallel import explore_parallel
 from gold_python.exceptions import WrongSymbolException
 from gold_python.util import call_func_iterable
-from gold_python.automata.util import PushdownTask, Task
+from gold_python.automata.util import PushdownTask, Task, _Queue
 
 EMPTY_TRANSITION = ""
 
@@ -30,66 +28,363 @@ class AutomatonStack:
     This class is used to represent the stack of a pushdown automata. Do take in mind
     that pop operations must give the symbols that are popped, and that the stack
     will throw an exception if the wrong symbol is popped.
+
+    The symbols are stored in an immutable linked list, shared between copies of the
+    stack, so copying a stack takes constant time no matter its depth. Each stack only
+    moves its own pointer to the top of the list when symbols are pushed or popped.
+    Symbols must be hashable, so stacks can be hashed and compared cheaply.
+
+    Args:
+        items (Iterable): The symbols initially on the stack, from bottom to top
     """
 
-    def __init__(self):
-        self.list = []
+    __slots__ = ("_top",)
+
+    def __init__(self, items: Iterable = ()):
+        # Each cell is a tuple of (symbol, cell below, depth, hash), None being the empty stack
+        self._top: Tuple | None = None
+        self.push(*items)
 
     def pop(self, *symbols):
         """
         Pop symbols from the stack.
 
         Args:
-            symbols (str): The symbols to pop from the stack
+            symbols (str): The symbols to pop from the stack, starting from the top
         Raises:
-            WrongSymbolException: If the wrong symbol is popped from the stack
+            WrongSymbolException: If the wrong symbol is popped from the stack, or the stack is empty
         """
         for symbol in symbols:
-            obtained = self.list.pop()
+            if self._top is None:
+                raise WrongSymbolException(symbol, None)
+            obtained, self._top = self._top[0], self._top[1]
             if obtained != symbol:
-                raise WrongSymbolException(obtained, symbol)
+                raise WrongSymbolException(symbol, obtained)
 
     def push(self, *items):
         """
         Push symbols onto the stack.
 
         Args:
-            items (str): The symbols to push onto the stack
+            items (str): The symbols to push onto the stack, the last one ending on top
         """
-        self.list.extend(items)
+        top = self._top
+        for item in items:
+            if top is None:
+                top = (item, None, 1, hash((item,)))
+            else:
+                top = (item, top, top[2] + 1, hash((item, top[3])))
+        self._top = top
 
     def peek(self, *symbols):
         """
         Check if the top of the stack contains certain symbols.
 
         Args:
-            symbols (str): The symbols to check for
+            symbols (str): The symbols to check for, starting from the top
         """
-        if len(symbols) > len(list):
-            return False
-        i = -1
+        cell = self._top
         for symbol in symbols:
-            if self.list[i] != symbol[i]:
+            if cell is None or cell[0] != symbol:
                 return False
-            i -= 1
+            cell = cell[1]
         return True
 
+    @property
+    def list(self) -> List:
+        """
+        The symbols on the stack, from bottom to top
+        """
+        items = []
+        cell = self._top
+        while cell is not None:
+            items.append(cell[0])
+            cell = cell[1]
+        items.reverse()
+        return items
+
     def __len__(self):
-        return len(self.list)
+        return 0 if self._top is None else self._top[2]
 
     def __size__(self):
-        return len(self.list)
+        return len(self)
 
     def __str__(self) -> str:
         return f'"Stack: {self.list}'
 
     def __copy__(self):
         stack = AutomatonStack()
-        stack.list = deepcopy(self.list)
+        stack._top = self._top
         return stack
 
+    def __hash__(self) -> int:
+        return 0 if self._top is None else self._top[3]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AutomatonStack):
+            return NotImplemented
+
+        # Walk both lists until they reach a shared cell
+        mine, theirs = self._top, other._top
+        while mine is not theirs:
+            if (
+                mine is None
+                or theirs is None
+                or mine[2:] != theirs[2:]
+                or mine[0] != theirs[0]
+            ):
+                return False
+            mine, theirs = mine[1], theirs[1]
+        return True
+
+    def __reduce__(self):
+        # Stacks are pickled as a flat list, since the linked list could be too deep to recurse on
+        return AutomatonStack, (self.list,)
+
+
+class _PositionQueue(_Queue):
+    """
+    Queue that returns every task on a position of the tape before the tasks on the next one.
+
+    Tasks are only created on the same position as the task creating them, or on the next one,
+    so two queues are enough to order them.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.following: deque = deque()
+        self.length: int | None = None
+
+    def enqueue(self, item):
+        if self.length is None:
+            self.length = len(item.tape)
+
+        if len(item.tape) == self.length:
+            self.queue.append(item)
+        else:
+            self.following.append(item)
+
+    def dequeue(self):
+        # Move to the next position once every task on the current one has been run
+        if not self.queue and self.following:
+            self.queue, self.following = self.following, self.queue
+            self.length = len(self.queue[0].tape)
+        return super().dequeue()
+
+    def peek(self):
+        if self.queue:
+            return self.queue[0]
+        return self.following[0] if self.following else None
+
+    def __iter__(self):
+        yield from self.queue
+        yield from self.following
+
+    def __len__(self):
+        return len(self.queue) + len(self.following)
+
+
+class _GSSNode:
+    """
+    A node of a graph-structured stack.
+
+    Each node represents every stack formed by one of the stacks represented by the nodes
+    below it, with the symbol of the node on top. The bottom node has no symbol, and
+    represents the empty stack.
+    """
+
+    __slots__ = ("symbol", "below", "min_depth", "max_depth")
+
+    def __init__(self, symbol: Any, below: FrozenSet["_GSSNode"]) -> None:
+        self.symbol = symbol
+        self.below = below
+        self.min_depth: int = min((node.min_depth for node in below), default=-1) + 1
+        self.max_depth: int = max((node.max_depth for node in below), default=-1) + 1
+
+
+class _GraphStructuredStack:
+    """
+    A graph-structured stack, sharing the nodes of every stack explored on a single input.
+
+    Nodes are interned by their symbol and the nodes below them, so equal sets of stacks are
+    represented by the same nodes.
+    """
+
+    def __init__(self) -> None:
+        self.bottom = _GSSNode(None, frozenset())
+        self.empty: FrozenSet[_GSSNode] = frozenset([self.bottom])
+        self._nodes: Dict[Tuple[Any, FrozenSet[_GSSNode]], _GSSNode] = {}
+
+    def push(self, symbols: Iterable, tops: FrozenSet[_GSSNode]) -> FrozenSet[_GSSNode]:
+        """
+        Push symbols on top of every stack represented by the given nodes.
+        """
+        for symbol in symbols:
+            node = self._nodes.get((symbol, tops))
+            if node is None:
+                node = self._nodes[symbol, tops] = _GSSNode(symbol, tops)
+            tops = frozenset([node])
+        return tops
+
+    def limit(self, tops: FrozenSet[_GSSNode], depth: int) -> FrozenSet[_GSSNode]:
+        """
+        Keep only the stacks represented by the given nodes that are at most depth symbols deep.
+
+        Nodes that also represent deeper stacks are replaced by nodes with the same symbol,
+        over the stacks below them that are shallow enough.
+        """
+        limited: Dict[Tuple[_GSSNode, int], _GSSNode | None] = {}
+
+        def limit_node(node: _GSSNode, depth: int) -> _GSSNode | None:
+            if node.max_depth <= depth:
+                return node
+            if node.min_depth > depth:
+                return None
+
+            key = (node, depth)
+            if key not in limited:
+                below = frozenset(
+                    filter(None, (limit_node(child, depth - 1) for child in node.below))
+                )
+                limited[key] = next(iter(self.push([node.symbol], below)))
+            return limited[key]
+
+        return frozenset(filter(None, (limit_node(node, depth) for node in tops)))
+
+    def expand(
+        self, known: Tuple, tops: FrozenSet[_GSSNode]
+    ) -> List[Tuple[Tuple, FrozenSet[_GSSNode]]]:
+        """
+        Split a set of stacks by the symbol below the known symbols on top of them.
+
+        Args:
+            known (Tuple): Symbols known to be on top of the stacks, from bottom to top
+            tops (FrozenSet[_GSSNode]): The nodes below the known symbols
+        Returns:
+            List[Tuple[Tuple, FrozenSet[_GSSNode]]]: The known symbols and nodes below them of each part
+        """
+        groups: Dict[Any, Set[_GSSNode]] = defaultdict(set)
+        for node in tops:
+            if node is not self.bottom:
+                groups[node.symbol].add(node)
+
+        expanded = [
+            ((symbol,) + known, frozenset().union(*(node.below for node in nodes)))
+            for symbol, nodes in groups.items()
+        ]
+        if self.bottom in tops:
+            expanded.append((known, self.empty))
+        return expanded
+
+
+class _ShallowStackException(WrongSymbolException):
+    """
+    Raised when a stack on a graph-structured stack is accessed deeper than its known symbols
+    """
+
+    def __init__(self) -> None:
+        Exception.__init__(self, "The stack was accessed deeper than its known symbols")
+
+
+class _GSSStack(AutomatonStack):
+    """
+    Stack given to pushdown functions by the graph-structured stack engine.
+
+    It represents several stacks at once, sharing the known symbols on top, and the nodes of
+    the graph-structured stack below them. Accessing the stack below the known symbols marks it
+    as too shallow, so the engine runs the pushdown function again on more specific stacks.
+    """
+
+    __slots__ = ("_gss", "_items", "_tops", "_shallow")
+
+    def __init__(
+        self,
+        gss: _GraphStructuredStack,
+        known: Iterable,
+        tops: FrozenSet[_GSSNode],
+        shallow: List[bool],
+    ) -> None:
+        self._gss = gss
+        self._items = list(known)
+        self._tops = tops
+        self._shallow = shallow
+
+    def _too_shallow(self) -> _ShallowStackException:
+        self._shallow[0] = True
+        return _ShallowStackException()
+
+    def pop(self, *symbols):
+        for symbol in symbols:
+            if not self._items:
+                if self._tops == self._gss.empty:
+                    raise WrongSymbolException(symbol, None)
+                raise self._too_shallow()
+            obtained = self._items.pop()
+            if obtained != symbol:
+                raise WrongSymbolException(symbol, obtained)
+
+    def push(self, *items):
+        self._items.extend(items)
+
+    def peek(self, *symbols):
+        for i, symbol in enumerate(symbols):
+            if i >= len(self._items):
+                if self._tops == self._gss.empty:
+                    return False
+                raise self._too_shallow()
+            if self._items[-i - 1] != symbol:
+                return False
+        return True
+
+    @property
+    def list(self) -> List:
+        if self._tops != self._gss.empty:
+            raise self._too_shallow()
+        return list(self._items)
+
+    def __len__(self):
+        depths = set(node.min_depth for node in self._tops)
+        depths.update(node.max_depth for node in self._tops)
+        if len(depths) > 1:
+            raise self._too_shallow()
+        return len(self._items) + depths.pop()
+
+    def __copy__(self):
+        return _GSSStack(self._gss, self._items, self._tops, self._shallow)
+
+    def tops(self) -> FrozenSet[_GSSNode]:
+        """
+        The nodes of the graph-structured stack representing this stack
+        """
+        return self._gss.push(self._items, self._tops)
+
+    __hash__ = object.__hash__
+
+    def __eq__(self, other: object) -> bool:
+        return self is other
+
 
 class PushdownAutomata(AbstractNonDeterministicAutomata):
+    """
+    Class for pushdown automata.
+
+    Args:
+        states (Iterable): An iterable containing all states of the automata
+        alphabet (Iterable): An iterable containing all symbols in the alphabet of the automata
+        initial_state (Tuple | Any): The initial state of the automata
+        final_states (Tuple | List): An iterable containing all final states of the automata
+        delta (Callable): A function that takes as input a state, the stack and a symbol and returns the next state of the automata
+        max_stack_depth (int | None): The maximum depth of the stack, configurations with deeper stacks are not explored
+
+    Inputs are explored one position of the tape at a time, and configurations that have already
+    been explored, with the same state, position and stack, are skipped. Lambda transitions that
+    keep the automata on the same state are only taken when there is a maximum stack depth,
+    since otherwise they could grow the stack forever.
+
+    The network of a pushdown automata only has its states as nodes, since its transitions
+    depend on the stack and can't be listed without exploring an input.
+    """
+
     def __init__(
         self,
         states: Iterable,
@@ -97,13 +392,124 @@ class PushdownAutomata(AbstractNonDeterministicAutomata):
         initial_state: Tuple | Any,
         final_states: Tuple | List,
         delta: Callable,
+        max_stack_depth: int | None = None,
     ) -> None:
         super().__init__(states, alphabet, initial_state, final_states, delta)
+        self.max_stack_depth = max_stack_depth
 
-        # TODO: Network will be used for visualization, so implement it
+    def accepts_input(
+        self, tape: str, engine: str = "tree", workers: int | None = None
+    ) -> bool:
+        """
+        Check if the automata accepts the given input.
 
-    def accepts_input(self, tape: str) -> bool:
-        return self.accepts_input_path(tape)[0]
+        Args:
+            tape (str): The input string to check
+            engine (str): The engine used to explore the automata, either "tree" or "gss"
+            workers (int | None): The number of processes used by the "tree" engine
+        Returns:
+            bool: True if the automata accepts the input, False otherwise
+
+        The "tree" engine explores each configuration separately, as accepts_input_path does.
+        When workers is given, the configurations are explored by that many processes, see
+        the parallel module.
+        The "gss" engine advances every configuration one symbol at a time, merging the stacks of
+        configurations on the same state into a graph-structured stack, which keeps highly
+        non-deterministic automata from exploring an exponential number of stacks.
+        """
+        if engine == "tree":
+            if workers is not None:
+                return explore_parallel(self, tape, workers)
+            return self._explore(tape, False)[0]
+        elif engine == "gss":
+            if workers is not None:
+                raise ValueError("Workers can only be used with the 'tree' engine")
+            return self._accepts_input_gss(tape)
+        raise ValueError(f"Unknown engine {engine}, expected 'tree' or 'gss'")
+
+    def _accepts_input_gss(self, tape: str) -> bool:
+        if len(tape) == 0:
+            return self.initial_state in self.final_states
+
+        self._input_allowed(tape)
+
+        gss = _GraphStructuredStack()
+        frontier: Dict[Any, FrozenSet[_GSSNode]] = {self.initial_state: gss.empty}
+
+        for symbol in tape:
+            # Take every lambda transition before reading the symbol
+            configurations = self._gss_closure(gss, frontier)
+
+            # Read the symbol, merging the stacks of the configurations on the same state
+            following: Dict[Any, Set[_GSSNode]] = defaultdict(set)
+            for state, tops in configurations:
+                for nextState, nextTops in self._gss_step(gss, state, tops, symbol):
+                    following[nextState].update(nextTops)
+
+            if not following:
+                return False
+            frontier = {state: frozenset(tops) for state, tops in following.items()}
+
+        return any(
+            state in self.final_states and gss.bottom in tops
+            for state, tops in frontier.items()
+        )
+
+    def _gss_closure(
+        self, gss: _GraphStructuredStack, frontier: Dict[Any, FrozenSet[_GSSNode]]
+    ) -> Set[Tuple[Any, FrozenSet[_GSSNode]]]:
+        configurations = set(frontier.items())
+        pending = list(configurations)
+
+        while pending:
+            state, tops = pending.pop()
+            for nextState, nextTops in self._gss_step(
+                gss, state, tops, EMPTY_TRANSITION
+            ):
+                # Same rule as the tree engine for lambda transitions on the same state
+                if nextState == state and self.max_stack_depth is None:
+                    continue
+                if (nextState, nextTops) not in configurations:
+                    configurations.add((nextState, nextTops))
+                    pending.append((nextState, nextTops))
+
+        return configurations
+
+    def _gss_step(
+        self,
+        gss: _GraphStructuredStack,
+        state: Any,
+        tops: FrozenSet[_GSSNode],
+        symbol: str,
+    ) -> Set[Tuple[Any, FrozenSet[_GSSNode]]]:
+        results = set()
+        pending = [((), tops)]
+
+        while pending:
+            known, below = pending.pop()
+            shallow = [False]
+            stack: AutomatonStack = _GSSStack(gss, known, below, shallow)
+            nextStates = call_func_iterable(self.delta, state, stack, symbol)
+
+            # Run the function again on each group of stacks with a different symbol below
+            # the known ones, if it needed to look further down the stack
+            if shallow[0]:
+                pending.extend(gss.expand(known, below))
+                continue
+
+            for nextState, nextStack in nextStates:
+                nextTops = nextStack.tops()
+
+                # Drop the stacks that grew past the maximum depth, including the deeper
+                # stacks merged into the same nodes as shallower ones
+                if self.max_stack_depth is not None:
+                    nextTops = gss.limit(nextTops, self.max_stack_depth)
+                    if not nextTops:
+                        continue
+
+                results.add((nextState, nextTops))
+
+        return results
 
     def accepts_input_path(self, tape: str) -> Tuple[bool, List]:
         """
@@ -115,20 +521,25 @@ class PushdownAutomata(AbstractNonDeterministicAutomata):
             Tuple[bool, List]: A tuple containing a boolean representing if the automata accepts the input, and a list containing the path taken by the automata if it accepts the input.
 
         This is a separate method from accepts_input, since it returns the path taken by the automata if it accepts the input.
+        The path is a list of (state, tape, stack) tuples, starting from the final state and ending on the initial state.
         """
+        return self._explore(tape, True)
+
+    def _explore(self, tape: str, trace: bool) -> Tuple[bool, List]:
         if len(tape) == 0:
             return self.initial_state in self.final_states, []
 
-        # Create queue for tasks and a return queue to check if a path has been found
+        # Create queue for tasks and a return queue to check if a path has been found,
+        # as well as a set of the configurations already explored
 
-        queue: _Queue = _Queue()
+        queue: _Queue = self._new_queue()
         return_queue: _Queue = _Queue(1)
+        visited: Set[Tuple] = set()
 
         self._input_allowed(tape)
 
-        # Create root node, and add tasks to queue
-        root = Node((self.initial_state, tape))
-        self._prepare_queue(root, tape, queue)
+        # Add initial tasks to queue
+        self._prepare_queue(tape, queue)
 
         # Main loop to process tasks
         while True:
@@ -140,83 +551,94 @@ class PushdownAutomata(AbstractNonDeterministicAutomata):
             if task is None:
                 break
 
-            self._run_task_stack(task, queue, return_queue)
+            self._run_task_stack(task, queue, return_queue, trace, visited)
 
         # Check if path has been found, and construct path if it has
         if return_queue.peek() is not None:
             final_state: PushdownTask = return_queue.dequeue()
-            path = [(final_state.state, final_state.tape, final_state.stack)] + [
-                node.name for node in final_state.node.iter_path_reverse()
+            path = [
+                (step.state, step.tape, step.stack)
+                for step in final_state.iter_path_reverse()
+                if isinstance(step, PushdownTask)
             ]
             return True, path
         else:
             return False, []
 
-    def _prepare_queue(self, root: Node, tape: str, queue: _Queue):
+    def _new_queue(self) -> _Queue:
+        return _PositionQueue()
+
+    def _prepare_queue(self, tape: str, queue: _Queue):
         # Add initial tasks to queue, including lambda transitions
-        queue.enqueue(
-            PushdownTask(self.initial_state, AutomatonStack(), tape, tape[0], root)
-        )
-        queue.enqueue(
-            PushdownTask(self.initial_state, AutomatonStack(), tape, "", root)
-        )
+        queue.enqueue(PushdownTask(self.initial_state, AutomatonStack(), tape, tape[0]))
+        queue.enqueue(PushdownTask(self.initial_state, AutomatonStack(), tape, ""))
 
-    def _insert_node(self, state: Any, parent: Node, next: str):
-        return self._insert_node_stack(state, AutomatonStack(), parent, next)
-
-    def _insert_node_stack(
-        self, state: Any, stack: AutomatonStack, parent: Node, next: str
-    ):
-        # Insert node into tree using lock, and return node
-
-        lambda_next = next if next != EMPTY_TRANSITION else "λ"
-        display_text = f"{state}, {stack}, {lambda_next}"
-        with self.lock:
-            node = Node(display_text, parent=parent)
-        return node
-
-    def _run_task(self, task: Task, queue: _Queue, return_queue: _Queue) -> None:
-        self._run_task_stack(
-            PushdownTask(task.state, AutomatonStack(), task.tape, task.next, task.node),
-            queue,
-            return_queue,
-        )
+    def _run_task(
+        self,
+        task: Task,
+        queue: _Queue,
+        return_queue: _Queue,
+        trace: bool = True,
+        visited: Set[Tuple] | None = None,
+    ) -> None:
+        # Tasks without a stack start from an empty one
+        if not isinstance(task, PushdownTask):
+            task = PushdownTask(
+                task.state, AutomatonStack(), task.tape, task.next, task
+            )
+        self._run_task_stack(task, queue, return_queue, trace, visited)
 
     def _run_task_stack(
         self,
         task: PushdownTask,
         queue: _Queue,
         return_queue: _Queue,
+        trace: bool = True,
+        visited: Set[Tuple] | None = None,
     ) -> None:
-        # Insert node into tree, if empty transition, insert lambda symbol
-        node = self._insert_node_stack(
-            (task.state, task.tape), task.stack, task.node, task.next
-        )
-
         # Finish task if tape is empty, and add to return queue if final state
         if len(task.tape) == 0:
             if task.state in self.final_states and len(task.stack) == 0:
                 return_queue.enqueue(task)
             return
+
+        # Skip configurations that have already been explored. Stacks are hashed and compared
+        # through the cells they share, so they are cheap to use as part of the key
+        if visited is not None:
+            configuration = task.configuration()
+            if configuration in visited:
+                return
+            visited.add(configuration)
+
+        # Only keep a pointer to the parent task when the path has been requested
+        parent = task if trace else None
+
         # Exception handling is done in delta function, so no need to check for exceptions here
         nextStates = call_func_iterable(self.delta, task.state, task.stack, task.next)
 
         # Add tasks to queue, and increment task counter. Increment task counter by 2, since each task creates 2 new tasks, one for the next symbol, and one for lambda transition
         for state, stack in set(nextStates):
+            # Drop configurations whose stack grew past the maximum depth
+            if self.max_stack_depth is not None and len(stack) > self.max_stack_depth:
+                continue
+
             if task.next == EMPTY_TRANSITION:
-                # If empty transition, don't add lambda transition, to avoid infinite loops
-                if task.state == state:
+                # If empty transition, don't add lambda transition, to avoid infinite loops.
+                # With a maximum stack depth, loops are already bounded by the depth
+                if task.state == state and self.max_stack_depth is None:
                     continue
                 continue_task = PushdownTask(
-                    state, stack, task.tape, task.tape[0], node
+                    state, stack, task.tape, task.tape[0], parent
                 )
-                lambda_task = PushdownTask(state, stack, task.tape, "", node)
+                lambda_task = PushdownTask(state, stack, task.tape, "", parent)
             else:
                 next_symbol = EMPTY_TRANSITION if len(task.tape) == 1 else task.tape[1]
                 next_tape = task.tape[1:]
 
-                continue_task = PushdownTask(state, stack, next_tape, next_symbol, node)
-                lambda_task = PushdownTask(state, stack, next_tape, "", node)
+                continue_task = PushdownTask(
+                    state, stack, next_tape, next_symbol, parent
+                )
+                lambda_task = PushdownTask(state, stack, next_tape, "", parent)
 
             queue.enqueue(continue_task)
             queue.enqueue(lambda_task)
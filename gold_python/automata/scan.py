@@ -0,0 +1,255 @@
+"""
+This module contains scanners, finding the matches of deterministic automata inside a text.
+
+A scanner runs a transition table from each position of the text, looking for the longest
+prefix of the rest of the text the table accepts. Searching from every position separately
+takes quadratic time, so scanners remember every configuration, a state at a position, from
+which no accepting state can be reached further on the text, and stop as soon as they reach
+one again. Every configuration is then run at most once per match, so the whole text is
+scanned in linear time. Scanning also stops on states from which no accepting state can be
+reached at all.
+
+Failed configurations are kept as a bitmap with a bit per state for each position, and the
+positions before the start of the current search are dropped, since no later search can
+reach them. Memory then grows with the part of the text the current search has looked
+ahead over, instead of with the whole text.
+
+Bytes-like texts are read as byte values. Tables whose symbols are all single characters,
+such as the ones built by regex.compile, read each byte as its latin-1 character instead, so
+files can be scanned through a memory map with the same tables as strings.
+
+Lexers combine several deterministic automata into a single table, labeling each accepting
+state with the first automata accepting on it, so a text is split into tokens in one pass.
+"""
+
+from collections import defaultdict
+from functools import cached_property
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from gold_python.automata.table import BYTE_TAPES, TransitionTable
+from gold_python.exceptions import TokenNotFoundException
+
+
+class Scanner:
+    """
+    Class for finding the longest matches of a transition table inside a text.
+
+    Args:
+        table (TransitionTable): The table to run
+        labels (Iterable[int] | None): The label of each state, -1 for states that are not accepting, the final state mask if None
+    """
+
+    def __init__(self, table: TransitionTable, labels: Iterable[int] | None = None):
+        self.table = table
+        if labels is None:
+            labels = [0 if final else -1 for final in table.final.tolist()]
+        self.labels: List[int] = list(labels)
+        self.live: List[bool] = self._live_states()
+
+    def _live_states(self) -> List[bool]:
+        # States from which an accepting state can be reached, found backwards from them
+        predecessors = defaultdict(set)
+        for state, row in enumerate(self.table.transitions.tolist()):
+            for nextState in row:
+                predecessors[nextState].add(state)
+
+        live = [label >= 0 for label in self.labels]
+        pending = [state for state, accepting in enumerate(live) if accepting]
+        while pending:
+            for state in predecessors[pending.pop()]:
+                if not live[state]:
+                    live[state] = True
+                    pending.append(state)
+        return live
+
+    @cached_property
+    def _byte_rows(self) -> List[Dict[Any, int]]:
+        # Rows for byte tapes, keyed by the byte value of each single character symbol
+        rows = self.table._rows
+        if not all(
+            isinstance(symbol, str) and len(symbol) == 1
+            for symbol in self.table.symbols
+        ):
+            return rows
+        return [
+            {ord(symbol): nextState for symbol, nextState in row.items()}
+            for row in rows
+        ]
+
+    def scan(self, tape: Any, skip: bool = True) -> Iterator[Tuple[int, int, int]]:
+        """
+        Find the leftmost-longest, non-overlapping matches of the table on a tape.
+
+        Args:
+            tape (Any): The text to scan, bytes-like tapes are read as byte values, or as latin-1 characters if every symbol is a single character
+            skip (bool): Whether to skip the positions where no match starts, instead of raising an exception
+        Returns:
+            Iterator[Tuple[int, int, int]]: The start, end and label of each match
+        Raises:
+            TokenNotFoundException: If no match starts at a position, and skip is False
+
+        Matches are searched from the start of the tape, and each search continues after the
+        previous match. Empty matches are not returned. Symbols that are not part of the
+        alphabet of the table are never part of a match.
+        """
+        if isinstance(tape, BYTE_TAPES):
+            tape = memoryview(tape).cast("B")
+            rows = self._byte_rows
+        else:
+            rows = self.table._rows
+        labels = self.labels
+        live = self.live
+        initial = self.table.initial
+        length = len(tape)
+
+        # Bitmaps of the states known not to reach an accepting state any further, with
+        # width bytes for each position from base on
+        width = (len(labels) + 7) // 8
+        failed = bytearray()
+        base = 0
+
+        position = 0
+        while position < length:
+            # Searches only check the positions after their start, so earlier ones are dropped
+            del failed[: (position - base) * width]
+            base = position
+
+            state = initial
+            index = position
+            end = position
+            endState = initial
+            label = -1
+
+            while index < length:
+                nextState = rows[state].get(tape[index])
+                if nextState is None or not live[nextState]:
+                    break
+                state = nextState
+                index += 1
+
+                offset = (index - base) * width + (state >> 3)
+                if offset < len(failed) and failed[offset] >> (state & 7) & 1:
+                    break
+                if labels[state] >= 0:
+                    end = index
+                    endState = state
+                    label = labels[state]
+
+            # Every configuration after the last accepting one has failed, they are found by
+            # running the table again from it instead of being stored along the way
+            if index > end:
+                size = (index - base + 1) * width
+                if len(failed) < size:
+                    failed.extend(bytes(size - len(failed)))
+
+                state = endState
+                for step in range(end, index):
+                    state = rows[state][tape[step]]
+                    offset = (step + 1 - base) * width + (state >> 3)
+                    failed[offset] |= 1 << (state & 7)
+
+            if end > position:
+                yield position, end, label
+                position = end
+            elif skip:
+                position += 1
+            else:
+                raise TokenNotFoundException(position)
+
+
+class Lexer:
+    """
+    Class for splitting a text into tokens, each described by a deterministic automata.
+
+    Args:
+        automata_by_token (Dict[Any, DeterministicAutomata]): The automata accepting each token
+
+    The automata are combined into a single table, whose states are tuples with the state of
+    each automata, or -1 once an automata can't continue. Only the tuples reachable from the
+    initial states are created. The alphabet of the lexer is the union of the alphabets of
+    every automata.
+
+    Tokens are found by maximal munch: the longest prefix of the rest of the text accepted by
+    any automata is the next token. When several automata accept it, the token given first
+    wins.
+    """
+
+    def __init__(self, automata_by_token: Dict[Any, Any]) -> None:
+        self.tokens = list(automata_by_token)
+        tables: List[TransitionTable] = [
+            automata.table for automata in automata_by_token.values()
+        ]
+        symbols = list(
+            dict.fromkeys(symbol for table in tables for symbol in table.symbols)
+        )
+        rows = [table._rows for table in tables]
+        finals = [table._final for table in tables]
+
+        initial = tuple(table.initial for table in tables)
+        states = [initial]
+        index = {initial: 0}
+        transitions = []
+
+        # Breadth-first search over the tuples of states reachable from the initial states
+        for state in states:
+            row = []
+            for symbol in symbols:
+                nextState = tuple(
+                    -1 if current < 0 else tableRows[current].get(symbol, -1)
+                    for current, tableRows in zip(state, rows)
+                )
+                if nextState not in index:
+                    index[nextState] = len(states)
+                    states.append(nextState)
+                row.append(index[nextState])
+            transitions.append(row)
+
+        labels = [
+            next(
+                (
+                    token
+                    for token, (current, final) in enumerate(zip(state, finals))
+                    if current >= 0 and final[current]
+                ),
+                -1,
+            )
+            for state in states
+        ]
+
+        table = TransitionTable(
+            states, symbols, transitions, 0, [label >= 0 for label in labels]
+        )
+        self.scanner = Scanner(table, labels)
+
+    def tokenize(self, tape: Any) -> Iterator[Tuple[Any, int, int]]:
+        """
+        Split a text into tokens.
+
+        Args:
+            tape (Any): The text to split, bytes-like tapes are read as byte values, or as latin-1 characters if every symbol is a single character
+        Returns:
+            Iterator[Tuple[Any, int, int]]: The token, start and end of each part of the text
+        Raises:
+            TokenNotFoundException: If no token starts at a position of the text
+        """
+        for start, end, label in self.scanner.scan(tape, skip=False):
+            yield self.tokens[label], start, end
+
+
+def tokenize(
+    tape: Any, automata_by_token: Dict[Any, Any]
+) -> Iterator[Tuple[Any, int, int]]:
+    """
+    Split a text into tokens, each described by a deterministic automata.
+
+    Args:
+        tape (Any): The text to split, bytes-like tapes are read as byte values, or as latin-1 characters if every symbol is a single character
+        automata_by_token (Dict[Any, DeterministicAutomata]): The automata accepting each token
+    Returns:
+        Iterator[Tuple[Any, int, int]]: The token, start and end of each part of the text
+    Raises:
+        TokenNotFoundException: If no token starts at a position of the text
+
+    This function creates a Lexer on every call, create one directly to split several texts.
+    """
+    return Lexer(automata_by_token).tokenize(tape)
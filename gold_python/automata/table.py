@@ -0,0 +1,1014 @@
+"""
+This module contains the compiled representation of deterministic automata.
+
+Deterministic automata call their delta function for every state and symbol
+when they are created. The results of those calls are stored here as a dense
+integer table, so running the automata is a matter of table lookups instead of
+calls to the delta function.
+"""
+
+import mmap
+import os
+import pickle
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import cached_property
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Mapping,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+import numpy as np
+
+from gold_python.exceptions import (
+    AlphabetMismatchException,
+    InitialStateNotFoundException,
+    MultiplePathsFoundException,
+    OutputSymbolNotFoundException,
+    PathNotFoundException,
+    StateNotFoundException,
+    SymbolNotFoundException,
+    TableFormatException,
+)
+from gold_python.util import call_func_iterable
+from gold_python.automata.util import _pool_context, as_state
+from gold_python.sets.spaces import StateSpace
+
+BYTE_TAPES = (bytes, bytearray, memoryview, mmap.mmap)
+"""
+Types of tapes read as a sequence of byte values
+"""
+
+Tape = str | bytes | bytearray | memoryview | mmap.mmap | Sequence
+"""
+Types of tapes tables run over: strings, bytes-like tapes, or sequences of symbols
+"""
+
+BYTE_CHUNK_SIZE = 1 << 16
+
+OUTPUT_CHUNK_SIZE = 1 << 12
+
+TABLE_FORMAT = "gold-python-table"
+"""
+Name of the format of saved transition tables
+"""
+
+TABLE_FORMAT_VERSION = 1
+"""
+Version of the format of saved transition tables, increased on incompatible changes
+"""
+
+
+ROW_CHUNK_SIZE = 1 << 10
+"""
+Number of states whose transitions are computed together by a worker process
+"""
+
+MmapMode = Literal["r", "c"]
+"""
+Modes saved tables can be memory-mapped with, read-only or copy-on-write so loading never
+changes the saved files
+"""
+
+# Function and symbols of each worker process computing transitions
+_row_worker: dict = {}
+
+
+def _call_rows(delta: Callable, states: Iterable, symbols: List) -> List[List[list]]:
+    # Call the function for every state and symbol, without checking the results
+    return [
+        [call_func_iterable(delta, state, symbol) for symbol in symbols]
+        for state in states
+    ]
+
+
+def _init_row_worker(delta: Callable, symbols: List) -> None:
+    _row_worker["delta"] = delta
+    _row_worker["symbols"] = symbols
+
+
+def _call_rows_worker(states: List) -> List[List[list]]:
+    return _call_rows(_row_worker["delta"], states, _row_worker["symbols"])
+
+
+@contextmanager
+def _row_results(
+    delta: Callable, symbols: List, workers: int | None = None
+) -> Iterator[Callable[[Iterable], Iterator[Tuple[Any, List[list]]]]]:
+    """
+    Gives a function returning the results of delta for each state and every symbol.
+
+    With workers, the states are split into chunks computed by a pool of processes,
+    which is kept for as long as the context is open. At most two chunks per worker are
+    waiting at once, and the results are returned in the order of the states.
+    """
+    if workers is None:
+        yield lambda states: (
+            (state, _call_rows(delta, [state], symbols)[0]) for state in states
+        )
+        return
+
+    if workers < 1:
+        raise ValueError(f"The number of workers must be at least 1, got {workers}")
+
+    with ProcessPoolExecutor(
+        workers,
+        mp_context=_pool_context(),
+        initializer=_init_row_worker,
+        initargs=(delta, symbols),
+    ) as pool:
+
+        def results(states: Iterable) -> Iterator[Tuple[Any, List[list]]]:
+            states = iter(states)
+            pending: deque = deque()
+            while True:
+                while len(pending) < 2 * workers:
+                    chunk = list(islice(states, ROW_CHUNK_SIZE))
+                    if not chunk:
+                        break
+                    pending.append((chunk, pool.submit(_call_rows_worker, chunk)))
+                if not pending:
+                    return
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
+
+        yield results
+
+
+def _check_row(state: Any, symbols: List, results: List[list]) -> List[Any]:
+    # Check there is a single path for every symbol, returning the next states
+    row = []
+    for symbol, nextStates in zip(symbols, results):
+        if len(nextStates) < 1:
+            raise PathNotFoundException(symbol, state)
+        elif len(nextStates) > 1:
+            raise MultiplePathsFoundException(symbol, state)
+        row.append(as_state(nextStates[0]))
+    return row
+
+
+def _is_mapped(array: Any) -> bool:
+    # Arrays viewing a memory-mapped file keep it among their bases
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, "base", None)
+    return False
+
+
+def _index_states(states: Sequence | StateSpace) -> Mapping[Any, int]:
+    # The indices of the states of a state space are computed instead of stored
+    if isinstance(states, StateSpace):
+        return states.indexer()
+    return {state: i for i, state in enumerate(states)}
+
+
+class TransitionTable:
+    """
+    Class for the compiled transitions of a deterministic automata.
+
+    States and symbols are interned to consecutive integers, in the order given
+    by the states and symbols lists. States can also be given as a state space from the
+    sets module, whose states are indexed arithmetically instead of through a dict. The transitions are stored in a NumPy array
+    where ``transitions[i, j]`` is the index of the state reached from state ``i``
+    with symbol ``j``.
+
+    Args:
+        states (Sequence | StateSpace): A sequence or state space containing all states, indexed by their position
+        symbols (List): A list containing all symbols, indexed by their position
+        transitions (Iterable): A table of shape (len(states), len(symbols)) with the index of the next state
+        initial (int): The index of the initial state
+        final (Iterable): A boolean mask of shape (len(states)) marking the final states
+    """
+
+    def __init__(
+        self,
+        states: Sequence | StateSpace,
+        symbols: List,
+        transitions: Iterable,
+        initial: int,
+        final: Iterable,
+    ) -> None:
+        self.states = states if isinstance(states, StateSpace) else list(states)
+        self.symbols = list(symbols)
+        self.state_index: Mapping[Any, int] = _index_states(self.states)
+        self.symbol_index: Dict[Any, int] = {
+            symbol: i for i, symbol in enumerate(self.symbols)
+        }
+        self.transitions = np.asarray(transitions, dtype=np.int32).reshape(
+            len(self.states), len(self.symbols)
+        )
+        self.initial = initial
+        self.final = np.asarray(final, dtype=bool).reshape(len(self.states))
+        self.outputs: List[List[str]] | None = None
+        self.mapped = _is_mapped(self.transitions)
+
+        # Python mirrors of the arrays, since indexing NumPy arrays one element
+        # at a time is slower than indexing lists and dicts
+        self._final: List[bool] = self.final.tolist()
+        self._steps: List[Dict[Any, Tuple[int, str]]] = []
+        self._byte_table: List[int] | None = None
+
+    @cached_property
+    def _rows(self) -> List[Dict[Any, int]]:
+        # Built on first use, since it reads every transition of the table
+        return [dict(zip(self.symbols, row)) for row in self.transitions.tolist()]
+
+    def mirror(self) -> None:
+        """
+        Build the Python mirror of the transitions, which is faster to run over than the array.
+
+        Tables build the mirror on their first run, unless their transitions are memory-mapped,
+        in which case they run over the mapped array instead. The mirror is built separately
+        by each process, reading every page of the table, so memory-mapped tables only build it
+        when this method is called, when they are scanned, or when they are combined into a
+        Lexer.
+        """
+        self._rows
+
+    @classmethod
+    def from_function(
+        cls,
+        states: Iterable,
+        alphabet: Iterable,
+        initial_state: Any,
+        final_states: Iterable,
+        delta: Callable,
+        reachable: bool = False,
+        workers: int | None = None,
+    ) -> "TransitionTable":
+        """
+        Compile a delta function into a transition table.
+
+        Args:
+            states (Iterable): An iterable containing all states
+            alphabet (Iterable): An iterable containing all symbols
+            initial_state (Any): The initial state
+            final_states (Iterable): An iterable containing all final states
+            delta (Callable): The delta function to compile
+            reachable (bool): Whether to only compile the states reachable from the initial state
+            workers (int | None): The number of processes calling the delta function, if given
+        Returns:
+            TransitionTable: The compiled transitions
+        Raises:
+            PathNotFoundException: If a state has no transition for a symbol
+            MultiplePathsFoundException: If a state has more than one transition for a symbol
+            StateNotFoundException: If a transition leads to a state that is not in states
+            InitialStateNotFoundException: If the initial state is not in states
+
+        When reachable is True, the states are explored breadth-first from the initial state,
+        and states is only used to check that every state reached belongs to it. The delta
+        function is never called on unreachable states, and the states of the table are the
+        reachable ones, in the order they were found.
+
+        When workers is given, the delta function is called by a pool of worker processes on
+        chunks of states, one level at a time when reachable is True. The table is still built
+        by the calling process, which checks the results of the workers. Workers are started
+        as described by _pool_context in the util module.
+        """
+        if not isinstance(states, StateSpace):
+            states = [as_state(state) for state in states]
+        symbols = list(alphabet)
+        final_states = set(final_states)
+
+        initial_state = as_state(initial_state)
+        with _row_results(delta, symbols, workers) as results:
+            if reachable:
+                return cls._from_function_reachable(
+                    states, symbols, initial_state, final_states, results
+                )
+            return cls._from_function_full(
+                states, symbols, initial_state, final_states, results
+            )
+
+    @classmethod
+    def _from_function_full(
+        cls,
+        states: Sequence | StateSpace,
+        symbols: List,
+        initial_state: Any,
+        final_states: Set,
+        results: Callable,
+    ) -> "TransitionTable":
+        state_index = _index_states(states)
+        if initial_state not in state_index:
+            raise InitialStateNotFoundException(initial_state)
+
+        transitions = []
+        for state, result in results(states):
+            row = _check_row(state, symbols, result)
+            for symbol, nextState in zip(symbols, row):
+                if nextState not in state_index:
+                    raise StateNotFoundException(symbol, state, nextState)
+            transitions.append([state_index[nextState] for nextState in row])
+
+        final = [state in final_states for state in states]
+
+        return cls(states, symbols, transitions, state_index[initial_state], final)
+
+    @classmethod
+    def _from_function_reachable(
+        cls,
+        states: Sequence | StateSpace,
+        symbols: List,
+        initial_state: Any,
+        final_states: Set,
+        results: Callable,
+    ) -> "TransitionTable":
+        # States given as a list are only used to check membership
+        allowed: Set | StateSpace = (
+            states if isinstance(states, StateSpace) else set(states)
+        )
+        if initial_state not in allowed:
+            raise InitialStateNotFoundException(initial_state)
+
+        found = [initial_state]
+        state_index = {initial_state: 0}
+        transitions = []
+
+        # Breadth-first search, computing the transitions of a whole level at once
+        start = 0
+        while start < len(found):
+            level = found[start:]
+            start = len(found)
+
+            for state, result in results(level):
+                row = _check_row(state, symbols, result)
+                for symbol, nextState in zip(symbols, row):
+                    if nextState not in state_index:
+                        if nextState not in allowed:
+                            raise StateNotFoundException(symbol, state, nextState)
+                        state_index[nextState] = len(found)
+                        found.append(nextState)
+                transitions.append([state_index[nextState] for nextState in row])
+
+        final = [state in final_states for state in found]
+
+        return cls(found, symbols, transitions, 0, final)
+
+    def compile_outputs(
+        self,
+        transfunc: Callable,
+        output_alphabet: Iterable | None = None,
+        workers: int | None = None,
+    ) -> None:
+        """
+        Compile a transducer function into the output table of this table.
+
+        Args:
+            transfunc (Callable): The transducer function to compile
+            output_alphabet (Iterable | None): The symbols allowed in the outputs, any symbol if None
+            workers (int | None): The number of processes calling the transducer function, if given
+        Raises:
+            PathNotFoundException: If a state has no output for a symbol
+            OutputSymbolNotFoundException: If an output has symbols that are not in the output alphabet
+        """
+        outputs = []
+        with _row_results(transfunc, self.symbols, workers) as results:
+            for state, result in results(self.states):
+                row = []
+                for symbol, output in zip(self.symbols, result):
+                    if len(output) < 1:
+                        raise PathNotFoundException(symbol, state)
+                    row.append(output[0])
+                outputs.append(row)
+
+        # Verify once that every output only uses symbols of the output alphabet
+        if output_alphabet is not None:
+            missing = set(
+                outputSymbol
+                for row in outputs
+                for output in row
+                for outputSymbol in output
+            ).difference(output_alphabet)
+            if missing:
+                raise OutputSymbolNotFoundException(missing)
+
+        self.set_outputs(outputs)
+
+    def set_outputs(self, outputs: List[List[str]]) -> None:
+        """
+        Set the output table of this table.
+
+        Args:
+            outputs (List[List[str]]): A table of shape (len(states), len(symbols)) with the output of each transition
+        """
+        self.outputs = [list(row) for row in outputs]
+
+        # Each symbol maps to the next state and the output of the transition together
+        self._steps = [
+            dict(zip(self.symbols, zip(nextStates, row)))
+            for nextStates, row in zip(self.transitions.tolist(), self.outputs)
+        ]
+
+    def run(self, tape: Iterable, state: int | None = None) -> int:
+        """
+        Run the table over a tape.
+
+        Args:
+            tape (Iterable): The symbols to process, bytes-like tapes are read as byte values
+            state (int | None): The index of the state to start from, the initial state if None
+        Returns:
+            int: The index of the state reached after processing the tape
+        Raises:
+            SymbolNotFoundException: If a symbol is not part of the alphabet
+        """
+        if state is None:
+            state = self.initial
+
+        # Memory-mapped tables run over the mapped array, which is shared between processes,
+        # unless the mirror has been built
+        mirrored = not self.mapped or "_rows" in self.__dict__
+
+        if isinstance(tape, BYTE_TAPES):
+            tape = memoryview(tape).cast("B")
+            allowed = self.byte_alphabet
+            if allowed is not None and mirrored:
+                return self._run_bytes(tape, state, allowed)
+
+        if not mirrored:
+            return self._run_array(tape, state)
+
+        rows = self._rows
+        symbol = None
+        try:
+            for symbol in tape:
+                state = rows[state][symbol]
+        except KeyError:
+            raise SymbolNotFoundException(symbol) from None
+
+        return state
+
+    def _run_array(self, tape: Iterable, state: int) -> int:
+        transitions = self.transitions
+        symbol_index = self.symbol_index
+        symbol = None
+        try:
+            for symbol in tape:
+                state = transitions.item(state, symbol_index[symbol])
+        except KeyError:
+            raise SymbolNotFoundException(symbol) from None
+
+        return state
+
+    def _run_bytes(self, tape: memoryview, state: int, allowed: bytes) -> int:
+        flat = self._byte_rows()
+
+        # The flat table stores the next state multiplied by 256, so each byte is a single
+        # lookup. Bytes are copied in chunks, to validate them without a Python loop.
+        position = state * 256
+        for start in range(0, len(tape), BYTE_CHUNK_SIZE):
+            chunk = tape[start : start + BYTE_CHUNK_SIZE].tobytes()
+            missing = chunk.translate(None, allowed)
+            if missing:
+                raise SymbolNotFoundException(missing[0])
+            for byte in chunk:
+                position = flat[position + byte]
+
+        return position // 256
+
+    @cached_property
+    def byte_alphabet(self) -> bytes | None:
+        """
+        The alphabet as bytes if every symbol is a byte value (an int from 0 to 255), None otherwise
+        """
+        if all(type(symbol) is int and 0 <= symbol < 256 for symbol in self.symbols):
+            return bytes(self.symbols)
+        return None
+
+    def _byte_rows(self) -> List[int]:
+        # Table with 256 entries per state, one for each byte value
+        if self._byte_table is None:
+            table: np.ndarray = np.zeros((len(self.states), 256), dtype=np.int64)
+            table[:, list(self.symbols)] = self.transitions.astype(np.int64) * 256
+            self._byte_table = table.ravel().tolist()
+        return self._byte_table
+
+    def transduce(
+        self,
+        tape: Iterable,
+        state: int | None = None,
+        write: Callable[[str], Any] | None = None,
+    ) -> Tuple[List[str], int]:
+        """
+        Run the table over a tape, collecting the output of every transition.
+
+        Args:
+            tape (Iterable): The symbols to process
+            state (int | None): The index of the state to start from, the initial state if None
+            write (Callable[[str], Any] | None): A function the outputs are written to as the tape is processed
+        Returns:
+            Tuple[List[str], int]: The outputs of every transition, empty if they were written, and the index of the state reached
+        Raises:
+            SymbolNotFoundException: If a symbol is not part of the alphabet
+        """
+        steps = self._steps
+        if state is None:
+            state = self.initial
+
+        if isinstance(tape, BYTE_TAPES):
+            tape = memoryview(tape).cast("B")
+
+        outputs: List[str] = []
+        append = outputs.append
+        symbol = None
+        try:
+            for symbol in tape:
+                state, output = steps[state][symbol]
+                append(output)
+
+                # Write the outputs in batches, to avoid calling write for every symbol
+                if write is not None and len(outputs) >= OUTPUT_CHUNK_SIZE:
+                    write("".join(outputs))
+                    outputs.clear()
+        except KeyError:
+            raise SymbolNotFoundException(symbol) from None
+
+        if write is not None:
+            write("".join(outputs))
+            outputs.clear()
+
+        return outputs, state
+
+    def encode_many(self, tapes: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Encode a batch of tapes into a padded array of symbol indices.
+
+        Args:
+            tapes (Iterable): The tapes to encode
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: An array of shape (len(tapes), longest tape) with the
+            index of every symbol, padded with zeros, and an array with the length of every tape
+        Raises:
+            SymbolNotFoundException: If a symbol is not part of the alphabet
+        """
+        sequences: List[Any] = [
+            memoryview(tape).cast("B") if isinstance(tape, BYTE_TAPES) else tape
+            for tape in tapes
+        ]
+        lengths: np.ndarray = np.fromiter(
+            (len(tape) for tape in sequences), np.intp, len(sequences)
+        )
+        width = int(lengths.max()) if len(sequences) > 0 else 0
+        dtype = np.uint8 if len(self.symbols) <= 256 else np.int32
+        encoded: np.ndarray = np.zeros((len(sequences), width), dtype=dtype)
+
+        codes: np.ndarray
+        if all(isinstance(tape, str) for tape in sequences) and all(
+            isinstance(symbol, str) and len(symbol) == 1 for symbol in self.symbols
+        ):
+            codes = self._encode_text("".join(sequences))
+        elif self.byte_alphabet is not None and all(
+            isinstance(tape, BYTE_TAPES) for tape in sequences
+        ):
+            codes = self._encode_bytes(b"".join(sequences))
+        else:
+            codes = np.fromiter(
+                (self._symbol_code(symbol) for tape in sequences for symbol in tape),
+                np.int32,
+                int(lengths.sum()),
+            )
+
+        # Scatter the flat codes into their row and column of the padded array
+        rows: np.ndarray = np.repeat(np.arange(len(sequences)), lengths)
+        starts: np.ndarray = np.repeat(np.cumsum(lengths) - lengths, lengths)
+        encoded[rows, np.arange(len(codes)) - starts] = codes
+
+        return encoded, lengths
+
+    def _encode_text(self, text: str) -> np.ndarray:
+        # Map the code points of the text to symbol indices with a binary search
+        codepoints = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        alphabet = np.array([ord(symbol) for symbol in self.symbols], dtype=np.uint32)
+        order = np.argsort(alphabet)
+        alphabet = alphabet[order]
+        if len(alphabet) == 0 and len(codepoints) > 0:
+            raise SymbolNotFoundException(chr(codepoints[0]))
+
+        positions = np.asarray(np.searchsorted(alphabet, codepoints))
+        positions[positions == len(alphabet)] = 0
+        missing: np.ndarray = alphabet[positions] != codepoints
+        if missing.any():
+            raise SymbolNotFoundException(chr(codepoints[np.argmax(missing)]))
+
+        return order[positions]
+
+    def _encode_bytes(self, data: bytes) -> np.ndarray:
+        # Map the byte values to symbol indices with a 256 entry lookup array
+        lookup: np.ndarray = np.full(256, -1, dtype=np.int32)
+        lookup[list(self.symbols)] = np.arange(len(self.symbols))
+
+        codes: np.ndarray = lookup[np.frombuffer(data, dtype=np.uint8)]
+        missing: np.ndarray = codes < 0
+        if missing.any():
+            raise SymbolNotFoundException(data[int(np.argmax(missing))])
+
+        return codes
+
+    def _symbol_code(self, symbol: Any) -> int:
+        try:
+            return self.symbol_index[symbol]
+        except KeyError:
+            raise SymbolNotFoundException(symbol) from None
+
+    def run_many(self, tapes: Iterable) -> np.ndarray:
+        """
+        Run the table over a batch of tapes at once.
+
+        The tapes are encoded into a padded array, and the states of all tapes are advanced
+        one column at a time. Tapes shorter than the current column are masked out.
+
+        Args:
+            tapes (Iterable): The tapes to process
+        Returns:
+            np.ndarray: The index of the state reached after processing each tape
+        Raises:
+            SymbolNotFoundException: If a symbol is not part of the alphabet
+        """
+        encoded, lengths = self.encode_many(tapes)
+        states: np.ndarray = np.full(len(lengths), self.initial, dtype=np.int32)
+
+        for column in range(encoded.shape[1]):
+            active: np.ndarray = lengths > column
+            states = np.where(
+                active, self.transitions[states, encoded[:, column]], states
+            )
+
+        return states
+
+    def reachable(self) -> List[int]:
+        """
+        Returns the indices of the states reachable from the initial state, in breadth-first order
+        """
+        rows = self.transitions.tolist()
+        found = [False] * len(self.states)
+        found[self.initial] = True
+        order = [self.initial]
+
+        for state in order:
+            for nextState in rows[state]:
+                if not found[nextState]:
+                    found[nextState] = True
+                    order.append(nextState)
+
+        return order
+
+    def product(
+        self,
+        other: "TransitionTable",
+        accept: Callable[[np.ndarray, np.ndarray], np.ndarray],
+    ) -> "TransitionTable":
+        """
+        Build the product of this table and another one, running both at once.
+
+        Args:
+            other (TransitionTable): The other table, with the same symbols
+            accept (Callable[[np.ndarray, np.ndarray], np.ndarray]): A function combining the final state masks of both tables, such as np.logical_and
+        Returns:
+            TransitionTable: A table whose states are pairs of states of both tables
+        Raises:
+            AlphabetMismatchException: If the tables do not have the same symbols
+
+        Only the pairs reachable from the pair of initial states are created. They are found
+        breadth-first, computing the transitions of a whole level at once over the arrays.
+        """
+        if set(self.symbols) != set(other.symbols):
+            raise AlphabetMismatchException(self.symbols, other.symbols)
+
+        # Reorder the columns of the other table to match the symbols of this one
+        columns = [other.symbol_index[symbol] for symbol in self.symbols]
+        first = np.asarray(self.transitions, dtype=np.int64)
+        second = np.asarray(other.transitions, dtype=np.int64)[:, columns]
+        width = len(other.states)
+
+        # Pairs are encoded as a single integer, and interned in the order they are found
+        initial = self.initial * width + other.initial
+        codes = [initial]
+        index = {initial: 0}
+        rows = []
+
+        level = np.array([initial], dtype=np.int64)
+        while len(level):
+            nextCodes = first[level // width] * width + second[level % width]
+            unique, inverse = np.unique(nextCodes, return_inverse=True)
+
+            found = []
+            ids = []
+            for code in unique.tolist():
+                id = index.get(code)
+                if id is None:
+                    id = index[code] = len(codes)
+                    codes.append(code)
+                    found.append(code)
+                ids.append(id)
+
+            rows.append(
+                np.asarray(ids, dtype=np.int64)[inverse.reshape(-1)].reshape(
+                    nextCodes.shape
+                )
+            )
+            level = np.asarray(found, dtype=np.int64)
+
+        pairs = np.asarray(codes, dtype=np.int64)
+        final = accept(
+            np.asarray(self.final)[pairs // width],
+            np.asarray(other.final)[pairs % width],
+        )
+        states = [
+            (self.states[code // width], other.states[code % width]) for code in codes
+        ]
+        transitions = np.concatenate(rows)
+        return TransitionTable(states, self.symbols, transitions, 0, final)
+
+    def complement(self) -> "TransitionTable":
+        """
+        Build a table with the same transitions as this one, and every final state swapped.
+        """
+        return TransitionTable(
+            self.states, self.symbols, self.transitions, self.initial, ~self.final
+        )
+
+    def is_empty(self) -> bool:
+        """
+        Check if no final state can be reached from the initial state.
+        """
+        return not any(self._final[state] for state in self.reachable())
+
+    def minimize(self) -> "TransitionTable":
+        """
+        Create the minimal table equivalent to this one.
+
+        Unreachable states are removed, and equivalent states are merged using Hopcroft's
+        partition refinement algorithm. Each state of the new table is the first state of its
+        class of equivalent states, in breadth-first order from the initial state.
+
+        Returns:
+            TransitionTable: The minimal table
+        """
+        reachable = self.reachable()
+        local = {state: i for i, state in enumerate(reachable)}
+        rows = [
+            [local[nextState] for nextState in row]
+            for row in self.transitions[reachable].tolist()
+        ]
+        symbols = range(len(self.symbols))
+
+        # Inverse transitions for each symbol, restricted to the reachable states
+        inverse: List[List[List[int]]] = [[[] for _ in reachable] for _ in symbols]
+        for state, row in enumerate(rows):
+            for symbol in symbols:
+                inverse[symbol][row[symbol]].append(state)
+
+        # Start by splitting final and non-final states
+        final = [self._final[state] for state in reachable]
+        partition: List[Set[int]] = [
+            members
+            for members in (
+                set(i for i in range(len(reachable)) if final[i]),
+                set(i for i in range(len(reachable)) if not final[i]),
+            )
+            if members
+        ]
+        blockOf: List[int] = [0] * len(reachable)
+        for blockId, members in enumerate(partition):
+            for state in members:
+                blockOf[state] = blockId
+
+        smallest = min(range(len(partition)), key=lambda i: len(partition[i]))
+        pending: Set[Tuple[int, int]] = set((smallest, symbol) for symbol in symbols)
+
+        while pending:
+            splitter, symbol = pending.pop()
+
+            # Group the states leading into the splitter by the block they belong to
+            touched: Dict[int, List[int]] = defaultdict(list)
+            for state in partition[splitter]:
+                for previous in inverse[symbol][state]:
+                    touched[blockOf[previous]].append(previous)
+
+            for blockId, predecessors in touched.items():
+                if len(predecessors) == len(partition[blockId]):
+                    continue
+
+                # Split the block, and keep refining with the smaller half
+                split = set(predecessors)
+                partition[blockId] -= split
+                partition.append(split)
+                splitId = len(partition) - 1
+                for state in split:
+                    blockOf[state] = splitId
+
+                for other in symbols:
+                    if (blockId, other) in pending or len(split) <= len(
+                        partition[blockId]
+                    ):
+                        pending.add((splitId, other))
+                    else:
+                        pending.add((blockId, other))
+
+        # Number the blocks in breadth-first order, since reachable already follows it
+        numbering: Dict[int, int] = {}
+        representatives = []
+        for state in range(len(reachable)):
+            if blockOf[state] not in numbering:
+                numbering[blockOf[state]] = len(numbering)
+                representatives.append(state)
+
+        transitions = [
+            [numbering[blockOf[nextState]] for nextState in rows[state]]
+            for state in representatives
+        ]
+        return TransitionTable(
+            [self.states[reachable[state]] for state in representatives],
+            self.symbols,
+            transitions,
+            numbering[blockOf[0]],
+            [final[state] for state in representatives],
+        )
+
+    def save(
+        self,
+        path: str | os.PathLike,
+        kind: str = "table",
+        output_alphabet: Iterable | None = None,
+    ) -> None:
+        """
+        Save this table to a directory, creating it if it doesn't exist.
+
+        Args:
+            path (str | os.PathLike): The directory to save the table to
+            kind (str): The kind of automata the table belongs to
+            output_alphabet (Iterable | None): The output alphabet, for tables of transducers
+
+        The transitions and the final state mask are saved as NumPy arrays, in transitions.npy
+        and final.npy, so they can be memory-mapped when loaded. Everything else, including the
+        states, symbols and outputs, is pickled into header.pkl, along with the format version.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        header = {
+            "format": TABLE_FORMAT,
+            "version": TABLE_FORMAT_VERSION,
+            "kind": kind,
+            "states": self.states,
+            "symbols": self.symbols,
+            "initial": self.initial,
+            "outputs": self.outputs,
+            "output_alphabet": (
+                None if output_alphabet is None else list(output_alphabet)
+            ),
+        }
+
+        np.save(path / "transitions.npy", self.transitions, allow_pickle=False)
+        np.save(path / "final.npy", self.final, allow_pickle=False)
+        with open(path / "header.pkl", "wb") as file:
+            pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(
+        cls, path: str | os.PathLike, mmap_mode: MmapMode | None = "r"
+    ) -> "TransitionTable":
+        """
+        Load a table saved with save.
+
+        Args:
+            path (str | os.PathLike): The directory the table was saved to
+            mmap_mode (MmapMode | None): The mode the arrays are memory-mapped with, or None to read them into memory
+        Returns:
+            TransitionTable: The loaded table
+        Raises:
+            ValueError: If mmap_mode is not a supported mode
+            TableFormatException: If the directory does not hold a table in a supported format
+        """
+        return load_table(path, mmap_mode)[0]
+
+    def is_final(self, state: int) -> bool:
+        """
+        Check if the state with the given index is a final state.
+        """
+        return self._final[state]
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+
+def load_table(
+    path: str | os.PathLike, mmap_mode: MmapMode | None = "r"
+) -> Tuple[TransitionTable, Dict[str, Any]]:
+    """
+    Load a table saved with TransitionTable.save, along with its header.
+
+    Args:
+        path (str | os.PathLike): The directory the table was saved to
+        mmap_mode (MmapMode | None): The mode the arrays are memory-mapped with, or None to read them into memory
+    Returns:
+        Tuple[TransitionTable, Dict[str, Any]]: The loaded table and the header it was saved with
+    Raises:
+        ValueError: If mmap_mode is not a supported mode
+        TableFormatException: If the directory does not hold a table in a supported format
+
+    With the default mmap_mode, the arrays are not read until they are used, and processes
+    loading the same table share its pages, as long as the mirror of the table is not built,
+    see TransitionTable.mirror. The header is unpickled, so tables should only be loaded from
+    trusted sources.
+    """
+    if mmap_mode not in ("r", "c", None):
+        raise ValueError(
+            f"The memory-map mode must be 'r', 'c' or None, got {mmap_mode!r}"
+        )
+
+    path = Path(path)
+    try:
+        with open(path / "header.pkl", "rb") as file:
+            header = pickle.load(file)
+    except FileNotFoundError:
+        raise TableFormatException(path, "header.pkl is missing") from None
+
+    if not isinstance(header, dict) or header.get("format") != TABLE_FORMAT:
+        raise TableFormatException(path, "the header is not a transition table header")
+    if header.get("version") != TABLE_FORMAT_VERSION:
+        raise TableFormatException(
+            path,
+            f"version {header.get('version')} is not supported, "
+            f"expected version {TABLE_FORMAT_VERSION}",
+        )
+
+    table = TransitionTable(
+        header["states"],
+        header["symbols"],
+        np.load(path / "transitions.npy", mmap_mode=mmap_mode, allow_pickle=False),
+        header["initial"],
+        np.load(path / "final.npy", mmap_mode=mmap_mode, allow_pickle=False),
+    )
+    if header["outputs"] is not None:
+        table.set_outputs(header["outputs"])
+    return table, header
+
+
+class TableDelta:
+    """
+    Delta function that looks up the transitions of a transition table.
+
+    This class is used as the delta function of automata created directly from a
+    transition table, where there is no user defined delta function to call.
+
+    Args:
+        table (TransitionTable): The table to look up transitions in
+    """
+
+    def __init__(self, table: TransitionTable) -> None:
+        self.table = table
+
+    def _index(self, args: tuple) -> int | None:
+        # Iterable states are split into several arguments by call_func_iterable, so the
+        # state is looked up as each of the containers it could have been split from
+        state_index = self.table.state_index
+        candidates = [tuple(args[:-1]), frozenset(args[:-1])]
+        if len(args) == 2:
+            candidates.insert(0, args[0])
+        for state in candidates:
+            try:
+                index = state_index.get(state)
+            except TypeError:
+                continue
+            if index is not None:
+                return index
+        return None
+
+    def __call__(self, *args: Any) -> list:
+        symbol = args[-1]
+        index = self._index(args)
+        if index is None or symbol not in self.table.symbol_index:
+            return []
+        nextState = self.table.transitions.item(index, self.table.symbol_index[symbol])
+        return [self.table.states[nextState]]
+
+
+class TableOutput(TableDelta):
+    """
+    Transducer function that looks up the outputs of a transition table.
+
+    Args:
+        table (TransitionTable): The table to look up outputs in
+    """
+
+    def __call__(self, *args: Any) -> list:
+        symbol = args[-1]
+        index = self._index(args)
+        outputs = self.table.outputs
+        if index is None or outputs is None or symbol not in self.table.symbol_index:
+            return []
+        return [outputs[index][self.table.symbol_index[symbol]]]
@@ -3,26 +3,183 @@ Utility functions for automata.
 
 This module contains utility functions for automata.
 """
-from typing import Callable, Any
-from anytree import Node
+
+import multiprocessing as mp
+import sys
+from collections import deque
+from typing import Callable, Any, Dict, FrozenSet, Iterable, Iterator, List, Set, Tuple
 
 from gold_python.delta import _WrappedFunc
+from gold_python.sets.spaces import StateSpace
 
 Function = _WrappedFunc | Callable
 
 
+def as_state(state: Any) -> Any:
+    """
+    Returns the state in a hashable form, converting lists into tuples
+    """
+    return tuple(state) if isinstance(state, list) else state
+
+
+def as_states(states: Iterable) -> Set | StateSpace:
+    """
+    Returns the states as a set of hashable states, keeping state spaces as they are
+    """
+    if isinstance(states, StateSpace):
+        return states
+    return set([as_state(state) for state in states])
+
+
+def _pool_context() -> Any:
+    """
+    Returns the multiprocessing context used by every pool of worker processes
+
+    Workers are forked on Linux, so they inherit the automata and its delta functions instead
+    of receiving pickled copies. Other platforms use their default start method, since forking
+    is unsafe on macOS, and the automata and its delta functions must then be picklable, which
+    requires the delta functions to be defined at the top level of a module.
+    """
+    if sys.platform == "linux":
+        return mp.get_context("fork")
+    return mp.get_context()
+
+
+class StateInterner:
+    """
+    Maps each state to a small integer, the first time the state is interned.
+
+    Sets of interned states are cheaper to hash and compare than sets of the states
+    themselves, which can be arbitrary tuples.
+
+    Args:
+        states (Iterable): States to intern from the start
+    """
+
+    __slots__ = ("states", "ids")
+
+    def __init__(self, states: Iterable = ()) -> None:
+        self.states: List = []
+        self.ids: Dict[Any, int] = {}
+        for state in states:
+            self.intern(state)
+
+    def intern(self, state: Any) -> int:
+        """
+        Returns the integer of the given state, assigning the next one if it is new
+        """
+        id = self.ids.get(state)
+        if id is None:
+            id = self.ids[state] = len(self.states)
+            self.states.append(state)
+        return id
+
+    def intern_all(self, states: Iterable) -> FrozenSet[int]:
+        """
+        Returns the set of integers of the given states
+        """
+        return frozenset([self.intern(state) for state in states])
+
+    def state(self, id: int) -> Any:
+        """
+        Returns the state of the given integer
+        """
+        return self.states[id]
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+
+class _Queue:
+    def __init__(self, len=None):
+        self.queue = deque(maxlen=len)
+
+    def enqueue(self, item):
+        self.queue.append(item)
+
+    def dequeue(self):
+        if self.queue:
+            return self.queue.popleft()
+        else:
+            return None  # Return None when the queue is empty
+
+    def peek(self):
+        if self.queue:
+            return self.queue[0]
+        else:
+            return None  # Return None when the queue is empty
+
+    def __iter__(self):
+        return iter(self.queue)
+
+    def __len__(self):
+        return len(self.queue)
+
+
 class Task:
-    def __init__(self, state: Any, tape: str, next: str, node: Node) -> None:
+    """
+    A configuration of a non-deterministic automata waiting to be explored.
+
+    The parent is the task this task was created from, and is only kept when the path
+    taken by the automata has been requested.
+    """
+
+    __slots__ = ("state", "tape", "next", "parent")
+
+    def __init__(
+        self, state: Any, tape: str, next: str, parent: "Task | None" = None
+    ) -> None:
         self.state: Any = state
         self.tape: str = tape
         self.next: str = next
-        self.node: Node = node
+        self.parent: Task | None = parent
+
+    @classmethod
+    def from_configuration(cls, tape: str, configuration: Tuple) -> "Task":
+        """
+        Create the task for a configuration returned by the configuration method.
+
+        Args:
+            tape (str): The whole input of the automata
+            configuration (Tuple): The configuration of the task
+        """
+        state, remaining, next = configuration
+        return cls(state, tape[len(tape) - remaining :], next)
+
+    def configuration(self) -> Tuple:
+        """
+        The configuration of the automata this task explores, without the path to it.
+
+        The configuration is hashable and only holds the position on the tape, not the
+        rest of the tape, so it is cheap to compare and to send to other processes.
+        """
+        return (self.state, len(self.tape), self.next)
+
+    def iter_path_reverse(self) -> Iterator["Task"]:
+        """
+        Iterate through this task and its parents, up to the initial task.
+        """
+        task: Task | None = self
+        while task is not None:
+            yield task
+            task = task.parent
 
 
 class PushdownTask(Task):
-    def __init__(self, state, stack, tape, next, node) -> None:
-        self.state = state
+    """
+    A configuration of a pushdown automata waiting to be explored, including its stack.
+    """
+
+    __slots__ = ("stack",)
+
+    def __init__(self, state, stack, tape, next, parent=None) -> None:
+        super().__init__(state, tape, next, parent)
         self.stack = stack
-        self.tape = tape
-        self.next = next
-        self.node = node
+
+    @classmethod
+    def from_configuration(cls, tape: str, configuration: Tuple) -> "PushdownTask":
+        state, remaining, next, stack = configuration
+        return cls(state, stack, tape[len(tape) - remaining :], next)
+
+    def configuration(self) -> Tuple:
+        return (self.state, len(self.tape), self.next, self.stack)
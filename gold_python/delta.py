@@ -6,14 +6,28 @@ The delta functions are used by the automata classes in the automata module
 to determine the next state of the automata.
 """
 
-from collections import defaultdict
+from collections import namedtuple
 from inspect import signature
-from typing import Any, Callable
+from collections.abc import Set
+from typing import Any, Callable, Dict, Iterable, List
 from gold_python.exceptions import (
     NotEnoughArgumentsException,
     FunctionDefinitionNotFoundException,
 )
-from gold_python.util import combine, combine_stack
+from gold_python.util import NO_TRANSITION, NoTransition, combine, combine_stack
+
+
+def _as_container(items: Iterable | None) -> Any:
+    # Sets are kept as they are, other iterables are converted into a set
+    if items is None or isinstance(items, Set):
+        return items
+    return frozenset(items)
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+"""
+Statistics of the cache of a pure delta-like function
+"""
 
 
 class _WrappedFunc:
@@ -22,31 +36,163 @@ class _WrappedFunc:
 
     This class is not meant to be used directly, but rather instantiated by
     the decorators in this module.
+
+    If the function is pure, the results of each call are cached by their arguments and
+    their types, up to maxsize different arguments, like functools.lru_cache: a maxsize of
+    0 disables the cache, and None makes it unbounded. Calls with arguments that can't be
+    hashed are not cached.
+
+    The registered functions are bound into a single callable for each number of
+    arguments when they are registered, so each call only looks up that callable.
+
+    If the function is strict, exceptions raised by the registered functions are
+    propagated instead of being considered as having no transition.
+
+    The wrapper takes the name and module of the first function it wraps, and is pickled
+    as a reference to that name, like functions are. Only wrappers defined at the top
+    level of a module can be pickled.
     """
 
-    def __init__(self, func, combinefunc, minlen) -> None:
+    def __init__(
+        self,
+        func,
+        combinefunc,
+        minlen,
+        pure: bool = False,
+        maxsize: int | None = 65536,
+        strict: bool = False,
+    ) -> None:
         self.__combinefunc = combinefunc
+        self.__strict = strict
         self.__minlen = minlen
         self.__name = func.__name__
-        self.__registry: dict = defaultdict(list)
+        self.__module__ = func.__module__
+        self.__qualname__ = func.__qualname__
+        self.__doc__ = func.__doc__
+        self.__registry: Dict[int, List[Callable]] = {}
+        self.__dispatchers: Dict[int, Callable[..., list]] = {}
+        self.__pure = pure
+        self.__maxsize = maxsize if maxsize is None else max(maxsize, 0)
+        self.__cache: Dict[tuple, tuple] = {}
+        self.__hits = 0
+        self.__misses = 0
         self.register(func)
 
-    def register(self, func: Callable):
+    def register(
+        self,
+        func: Callable | None = None,
+        *,
+        symbols: Iterable | None = None,
+        states: Iterable | None = None,
+    ) -> Any:
         """
         Registers this function as callable by a delta-like function
+
+        If symbols is given, the function is only called for those symbols, and if states is
+        given, the function is only called from those states. Otherwise, it has no transition.
+        It can be used as @delta.register, or as @delta.register(symbols=..., states=...)
         """
+        if func is None:
+            return lambda func: self.register(func, symbols=symbols, states=states)
+
         paramLength = len(signature(func).parameters)
-        self.__registry[paramLength].append(func)
+        if symbols is None and states is None:
+            self.__registry.setdefault(paramLength, []).append(func)
+        else:
+            self.__registry.setdefault(paramLength, []).append(
+                self.__guard(func, paramLength, symbols, states)
+            )
+        if paramLength >= self.__minlen:
+            self.__dispatchers[paramLength] = self.__bind(self.__registry[paramLength])
+
+        # New overloads can change the result of any call
+        self.cache_clear()
         return func
 
+    def __guard(
+        self,
+        func: Callable,
+        paramLength: int,
+        symbols: Iterable | None,
+        states: Iterable | None,
+    ) -> Callable:
+        # The state is given by every argument before the symbol (and stack, on pushdown functions)
+        stateLength = paramLength - self.__minlen + 1
+        symbols = _as_container(symbols)
+        states = _as_container(states)
+
+        def guarded(*args: Any) -> Any:
+            if symbols is not None and args[-1] not in symbols:
+                return NO_TRANSITION
+            if states is not None:
+                state = args[0] if stateLength == 1 else args[:stateLength]
+                if state not in states:
+                    return NO_TRANSITION
+            return func(*args)
+
+        return guarded
+
+    def __bind(self, functions: List[Callable]) -> Callable[..., list]:
+        # Combine the functions registered for a number of arguments into one callable
+        combinefunc = self.__combinefunc
+        strict = self.__strict
+
+        def dispatch(*args: Any) -> list:
+            return combinefunc(functions, *args, strict=strict)
+
+        if not self.__pure:
+            return dispatch
+        return lambda *args: self.__cached(dispatch, args)
+
+    def __cached(self, dispatch: Callable[..., list], args: tuple) -> list:
+        # Equal arguments of different types, such as 1 and True, are cached separately
+        try:
+            key = args + tuple(type(arg) for arg in args)
+            result = self.__cache.get(key)
+        except TypeError:
+            # Arguments that can't be hashed can't be cached
+            return dispatch(*args)
+
+        if result is not None:
+            self.__hits += 1
+            return list(result)
+
+        self.__misses += 1
+        result = tuple(dispatch(*args))
+        if self.__maxsize != 0:
+            # Evict the oldest result once the cache is full
+            if self.__maxsize is not None and len(self.__cache) >= self.__maxsize:
+                del self.__cache[next(iter(self.__cache))]
+            self.__cache[key] = result
+        return list(result)
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Returns the statistics of the cache of this function
+        """
+        return CacheInfo(self.__hits, self.__misses, self.__maxsize, len(self.__cache))
+
+    def cache_clear(self) -> None:
+        """
+        Clears the cache of this function, along with its statistics
+        """
+        self.__cache.clear()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __reduce__(self) -> str:
+        # Pickled by reference, as described in the docstring of the class
+        return self.__qualname__
+
     def __call__(self, *args: Any) -> list:
-        if len(args) < self.__minlen:
-            raise NotEnoughArgumentsException(self.__name, self.__minlen, len(args))
+        dispatch = self.__dispatchers.get(len(args))
 
-        if len(self.__registry[len(args)]) < 1:
+        if dispatch is None:
+            if len(args) < self.__minlen:
+                raise NotEnoughArgumentsException(self.__name, self.__minlen, len(args))
             raise FunctionDefinitionNotFoundException(self.__name, len(args))
 
-        return self.__combinefunc(self.__registry[len(args)], *args)
+        return dispatch(*args)
 
 
 class _GoldDecorator:
@@ -55,20 +201,44 @@ class _GoldDecorator:
 
     This class is not meant to be used directly, but rather subclassed
     by the decorators in this module.
+
+    Decorators that allow it can be called with pure=True, and optionally
+    maxsize, to cache the results of the decorated function. Decorators can
+    also be called with strict=True, to propagate exceptions raised by the
+    decorated function.
     """
 
     def __init__(
-        self, decorator_type: str, min_len: int, combine_func: Callable
+        self,
+        decorator_type: str,
+        min_len: int,
+        combine_func: Callable,
+        allow_pure: bool = True,
     ) -> None:
         self.decorator_type = decorator_type
         self.min_len = min_len
         self.combine_func = combine_func
+        self.allow_pure = allow_pure
 
     def __repr__(self) -> str:
         return f"<{self.decorator_type} decorator>"
 
-    def __call__(self, func: Callable) -> _WrappedFunc:
-        return _WrappedFunc(func, self.combine_func, self.min_len)
+    def __call__(
+        self,
+        func: Callable | None = None,
+        *,
+        pure: bool = False,
+        maxsize: int | None = 65536,
+        strict: bool = False,
+    ) -> Any:
+        if pure and not self.allow_pure:
+            raise ValueError(f"The {self.decorator_type} decorator can't be pure")
+
+        if func is None:
+            return lambda func: self(func, pure=pure, maxsize=maxsize, strict=strict)
+        return _WrappedFunc(
+            func, self.combine_func, self.min_len, pure, maxsize, strict
+        )
 
 
 deltafunc = _GoldDecorator("deltafunc", 2, combine)
@@ -78,6 +248,13 @@ Declares this function as a delta function for automata.
 A delta function must have at least two arguments, and the last argument will
 always be the next symbol. The other arguments before that will be the current state,
 split into variables if the state is a tuple.
+
+Delta functions without side effects can be declared with @deltafunc(pure=True), so the
+result for each state and symbol is computed once and cached afterwards.
+
+A delta function returns NO_TRANSITION when there is no transition for the given state
+and symbol. Raising an exception also works, unless the function is declared with
+@deltafunc(strict=True), in which case the exception is propagated.
 """
 
 transducerfunc = _GoldDecorator("transducerfunc", 2, combine)
@@ -87,9 +264,12 @@ Declares this function as a transducer function for automata.
 A transducer function must have at least two arguments, and the last argument will
 always be the next symbol. The other arguments before that will be the current state,
 split into variables if the state is a tuple.
+
+Like delta functions, transducer functions without side effects can be declared with
+@transducerfunc(pure=True).
 """
 
-pushdownfunc = _GoldDecorator("pushdownfunc", 3, combine_stack)
+pushdownfunc = _GoldDecorator("pushdownfunc", 3, combine_stack, allow_pure=False)
 """
 Declares this function as a pushdown function for pushdown automata.
 
@@ -97,4 +277,6 @@ A pushdown function must have at least three arguments, the last argument will
 always be the next symbol, and the one before that is the current stack.
 The other arguments before that will be the current state,
 split into variables if the state is a tuple.
+
+Pushdown functions can't be pure, since they modify the stack they are given.
 """
@@ -57,13 +57,24 @@ class StateNotFoundException(Exception):
 
     def __init__(self, symbol, state, errstate) -> None:
         if hasattr(errstate, "__iter__") and not isinstance(errstate, str):
-            errstate = ", ".join(errstate)
+            errstate = ", ".join(str(state) for state in errstate)
 
         super().__init__(
             f"The state(s) {errstate} generated from the state {state} and symbol {symbol} is/are not part of the set of possible states for the automata"
         )
 
 
+class InitialStateNotFoundException(Exception):
+    """
+    Raised when the initial state is not part of the set of possible states for the automata
+    """
+
+    def __init__(self, state) -> None:
+        super().__init__(
+            f"The initial state {state} is not part of the set of possible states for the automata"
+        )
+
+
 class NotEnoughArgumentsException(Exception):
     """
     Raised when not enough arguments have been supplied to the delta-like function
@@ -93,3 +104,44 @@ class WrongSymbolException(Exception):
 
     def __init__(self, expected: str, got: str) -> None:
         super().__init__(f"Expected symbol {expected}, got {got} instead")
+
+
+class TableFormatException(Exception):
+    """
+    Raised when a saved automata is not in a format that can be loaded
+    """
+
+    def __init__(self, path, reason: str) -> None:
+        super().__init__(f"Could not load the automata saved in {path}: {reason}")
+
+
+class AlphabetMismatchException(Exception):
+    """
+    Raised when combining automata that do not share the same alphabet
+    """
+
+    def __init__(self, first, second) -> None:
+        missing = ", ".join(str(symbol) for symbol in set(first) ^ set(second))
+        super().__init__(
+            f"The automata must have the same alphabet, the symbols {missing} are only in one of them"
+        )
+
+
+class RegexSyntaxException(Exception):
+    """
+    Raised when a regular expression can't be parsed
+    """
+
+    def __init__(self, pattern: str, position: int, reason: str) -> None:
+        super().__init__(
+            f"Invalid regular expression {pattern!r} at position {position}: {reason}"
+        )
+
+
+class TokenNotFoundException(Exception):
+    """
+    Raised when no token starts at a position of the text being split into tokens
+    """
+
+    def __init__(self, position: int) -> None:
+        super().__init__(f"No token was found at position {position} of the text")
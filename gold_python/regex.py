@@ -0,0 +1,349 @@
+"""
+This module contains a compiler from regular expressions to automata.
+
+Regular expressions are parsed into a syntax tree, which is turned into a non-deterministic
+automata through Thompson's construction. That automata is then determinized and minimized
+into a deterministic automata, which runs over its transition table without calling any
+Python function per symbol.
+
+The supported syntax is a subset of the one of the re module:
+
+- Concatenation, ``ab``, and alternation, ``a|b``
+- Repetition with ``*``, ``+`` and ``?``, and grouping with parentheses
+- Character classes, such as ``[a-z0-9_]``, and negated character classes, such as ``[^ab]``
+- The ``.`` wildcard, matching any symbol of the alphabet
+- The ``\\d``, ``\\w`` and ``\\s`` classes, and escaping any other character with ``\\``
+
+The alphabet of the automata is the set of symbols used by the expression, unless one is
+given. Negated character classes and the ``.`` wildcard match symbols of the alphabet, so they
+need an alphabet to be given.
+"""
+
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from gold_python.automata.deterministic import DeterministicAutomata
+from gold_python.automata.nondeterministic import NonDeterministicAutomata
+from gold_python.automata.table import TransitionTable
+from gold_python.exceptions import RegexSyntaxException, SymbolNotFoundException
+from gold_python.sets.operations import between_char, union
+
+SPECIAL_CHARACTERS = "()[]|*+?.\\"
+"""
+Characters with a special meaning, which must be escaped to be matched
+"""
+
+CLASS_ESCAPES = {
+    "d": frozenset(between_char("0", "9")),
+    "w": frozenset(
+        union(
+            between_char("a", "z"),
+            between_char("A", "Z"),
+            between_char("0", "9"),
+            ["_"],
+        )
+    ),
+    "s": frozenset(" \t\n\r\f\v"),
+}
+"""
+Symbols matched by each escaped character class
+"""
+
+# Nodes of the syntax tree are tuples, the first element being the kind of node
+Node = Tuple
+
+
+class _Parser:
+    """
+    Recursive descent parser for regular expressions.
+
+    Args:
+        pattern (str): The regular expression to parse
+        alphabet (FrozenSet | None): The alphabet, needed by negated classes and the wildcard
+    """
+
+    def __init__(self, pattern: str, alphabet: FrozenSet | None) -> None:
+        self.pattern = pattern
+        self.alphabet = alphabet
+        self.position = 0
+        self.symbols: Set[str] = set()
+
+    def parse(self) -> Node:
+        node = self._alternation()
+        if self.position < len(self.pattern):
+            raise self._error("unbalanced parenthesis")
+        return node
+
+    def _error(self, reason: str) -> RegexSyntaxException:
+        return RegexSyntaxException(self.pattern, self.position, reason)
+
+    def _peek(self) -> str | None:
+        if self.position < len(self.pattern):
+            return self.pattern[self.position]
+        return None
+
+    def _next(self) -> str:
+        if self.position >= len(self.pattern):
+            raise self._error("unexpected end of pattern")
+        character = self.pattern[self.position]
+        self.position += 1
+        return character
+
+    def _alternation(self) -> Node:
+        node = self._concatenation()
+        while self._peek() == "|":
+            self.position += 1
+            node = ("union", node, self._concatenation())
+        return node
+
+    def _concatenation(self) -> Node:
+        node: Node = ("empty",)
+        while self._peek() not in (None, "|", ")"):
+            repeated = self._repetition()
+            node = repeated if node == ("empty",) else ("concat", node, repeated)
+        return node
+
+    def _repetition(self) -> Node:
+        node = self._atom()
+        while self._peek() in ("*", "+", "?"):
+            node = ({"*": "star", "+": "plus", "?": "optional"}[self._next()], node)
+        return node
+
+    def _atom(self) -> Node:
+        character = self._next()
+
+        if character == "(":
+            node = self._alternation()
+            if self._peek() != ")":
+                raise self._error("missing closing parenthesis")
+            self.position += 1
+            return node
+        if character == "[":
+            return self._symbols(self._class())
+        if character == ".":
+            return self._symbols(self._complement(frozenset(), "the . wildcard"))
+        if character == "\\":
+            return self._symbols(self._escape())
+        if character in "*+?":
+            raise self._error(f"nothing to repeat with {character}")
+        if character in ")]":
+            raise self._error(f"unbalanced {character}")
+        return self._symbols(frozenset(character))
+
+    def _escape(self) -> FrozenSet:
+        character = self._next()
+        return CLASS_ESCAPES.get(character, frozenset(character))
+
+    def _class(self) -> FrozenSet:
+        negated = self._peek() == "^"
+        if negated:
+            self.position += 1
+
+        symbols: Set[str] = set()
+        first = True
+        while first or self._peek() != "]":
+            first = False
+            character = self._next()
+            if character == "\\":
+                symbols.update(self._escape())
+                continue
+
+            # Ranges are written as a-b, a - at the end of the class is a literal
+            if self._peek() == "-" and self.pattern[
+                self.position + 1 : self.position + 2
+            ] not in ("", "]"):
+                self.position += 1
+                last = self._next()
+                if last == "\\":
+                    last = self._next()
+                if ord(last) < ord(character):
+                    raise self._error(f"bad character range {character}-{last}")
+                symbols.update(between_char(character, last))
+            else:
+                symbols.add(character)
+        self.position += 1
+
+        if negated:
+            return self._complement(frozenset(symbols), "negated character classes")
+        return frozenset(symbols)
+
+    def _complement(self, symbols: FrozenSet, feature: str) -> FrozenSet:
+        if self.alphabet is None:
+            raise self._error(f"an alphabet must be given to use {feature}")
+        return self.alphabet.difference(symbols)
+
+    def _symbols(self, symbols: FrozenSet) -> Node:
+        self.symbols.update(symbols)
+        return ("symbols", symbols)
+
+
+def escape(text: str) -> str:
+    """
+    Escape every special character of the text, so it is matched literally.
+    """
+    return "".join(
+        "\\" + character if character in SPECIAL_CHARACTERS else character
+        for character in text
+    )
+
+
+def parse(pattern: str, alphabet: Iterable | None = None) -> Node:
+    """
+    Parse a regular expression into a syntax tree.
+
+    Args:
+        pattern (str): The regular expression to parse
+        alphabet (Iterable | None): The alphabet, needed by negated classes and the wildcard
+    Returns:
+        Node: The syntax tree, made of tuples whose first element is the kind of node
+    Raises:
+        RegexSyntaxException: If the pattern is not a valid regular expression
+    """
+    return _Parser(pattern, None if alphabet is None else frozenset(alphabet)).parse()
+
+
+class _ThompsonDelta:
+    """
+    Delta function of the automata created by Thompson's construction.
+
+    Args:
+        edges (Dict[Tuple[int, str], List[int]]): The next states of each state and symbol
+    """
+
+    def __init__(self, edges: Dict[Tuple[int, str], List[int]]) -> None:
+        self.edges = edges
+
+    def __call__(self, state: int, symbol: str) -> List[int]:
+        return self.edges.get((state, symbol), [])
+
+
+class _ThompsonBuilder:
+    """
+    Builds the states and transitions of Thompson's construction for a syntax tree.
+    """
+
+    def __init__(self) -> None:
+        self.states = 0
+        self.edges: Dict[Tuple[int, str], List[int]] = defaultdict(list)
+
+    def _state(self) -> int:
+        self.states += 1
+        return self.states - 1
+
+    def _edge(self, state: int, symbol: str, nextState: int) -> None:
+        self.edges[state, symbol].append(nextState)
+
+    def build(self, node: Node) -> Tuple[int, int]:
+        """
+        Add the states of a node, returning its start and end states.
+        """
+        kind = node[0]
+        start = self._state()
+
+        if kind == "concat":
+            first, middle = self.build(node[1])
+            second, end = self.build(node[2])
+            self._edge(start, "", first)
+            self._edge(middle, "", second)
+            return start, end
+
+        end = self._state()
+        if kind == "empty":
+            self._edge(start, "", end)
+        elif kind == "symbols":
+            for symbol in node[1]:
+                self._edge(start, symbol, end)
+        elif kind == "union":
+            for child in node[1:]:
+                childStart, childEnd = self.build(child)
+                self._edge(start, "", childStart)
+                self._edge(childEnd, "", end)
+        else:
+            childStart, childEnd = self.build(node[1])
+            self._edge(start, "", childStart)
+            self._edge(childEnd, "", end)
+            if kind in ("star", "optional"):
+                self._edge(start, "", end)
+            if kind in ("star", "plus"):
+                self._edge(childEnd, "", childStart)
+        return start, end
+
+    def closure(self, state: int) -> Set[int]:
+        """
+        The states reachable from the given one through lambda transitions.
+        """
+        reached = {state}
+        pending = [state]
+        while pending:
+            for nextState in self.edges.get((pending.pop(), ""), []):
+                if nextState not in reached:
+                    reached.add(nextState)
+                    pending.append(nextState)
+        return reached
+
+
+def to_nfa(pattern: str, alphabet: Iterable | None = None) -> NonDeterministicAutomata:
+    """
+    Compile a regular expression into a non-deterministic automata.
+
+    Args:
+        pattern (str): The regular expression to compile
+        alphabet (Iterable | None): The alphabet of the automata, the symbols of the pattern if None
+    Returns:
+        NonDeterministicAutomata: An automata accepting the strings matched by the whole pattern
+    Raises:
+        RegexSyntaxException: If the pattern is not a valid regular expression
+        SymbolNotFoundException: If the pattern uses a symbol that is not in the given alphabet
+
+    The automata is built through Thompson's construction, its states being integers. Lambda
+    transitions are only taken before reading each symbol, so every state that reaches the
+    end of the expression through lambda transitions is a final state.
+    """
+    alphabet = None if alphabet is None else frozenset(alphabet)
+    parser = _Parser(pattern, alphabet)
+    tree = parser.parse()
+
+    if alphabet is None:
+        alphabet = frozenset(parser.symbols)
+    for symbol in parser.symbols.difference(alphabet):
+        raise SymbolNotFoundException(symbol)
+
+    builder = _ThompsonBuilder()
+    start, end = builder.build(tree)
+    states = range(builder.states)
+    final = [state for state in states if end in builder.closure(state)]
+
+    return NonDeterministicAutomata(
+        states, alphabet, start, final, _ThompsonDelta(dict(builder.edges))
+    )
+
+
+def compile(
+    pattern: str, alphabet: Iterable | None = None, minimize: bool = True
+) -> DeterministicAutomata:
+    """
+    Compile a regular expression into a deterministic automata.
+
+    Args:
+        pattern (str): The regular expression to compile
+        alphabet (Iterable | None): The alphabet of the automata, the symbols of the pattern if None
+        minimize (bool): Whether to minimize the automata
+    Returns:
+        DeterministicAutomata: An automata accepting the strings matched by the whole pattern
+    Raises:
+        RegexSyntaxException: If the pattern is not a valid regular expression
+        SymbolNotFoundException: If the pattern uses a symbol that is not in the given alphabet
+
+    The automata created by to_nfa is determinized through subset construction and then
+    minimized. The states of the resulting automata are numbered from 0, in breadth-first
+    order from the initial state.
+    """
+    table = to_nfa(pattern, alphabet).determinize().table
+    if minimize:
+        table = table.minimize()
+
+    # Number the states, instead of keeping the sets of states of the construction
+    table = TransitionTable(
+        range(len(table)), table.symbols, table.transitions, table.initial, table.final
+    )
+    return DeterministicAutomata.from_table(table)
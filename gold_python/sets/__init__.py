@@ -5,3 +5,4 @@ The __init__.py files are required to make Python treat directories
 containing the file as packages.
 """
 from gold_python.sets.operations import *
+from gold_python.sets.spaces import ProductSpace, Range, StateIndex, StateSpace
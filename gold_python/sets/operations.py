@@ -39,8 +39,10 @@ def union(*args: List) -> Set:
     return set(itertools.chain(*args))
 
 
-def product(*args: List) -> Set:
+def product(*args: Iterable) -> Set:
     """
     Returns the cartesian product of all iterables
+
+    The product is materialized into a set, use ProductSpace for a lazy product.
     """
     return set(itertools.product(*args))
@@ -0,0 +1,249 @@
+"""
+This module contains lazy sets of states
+
+The sets in this module describe their elements instead of storing them, so large sets of
+states, such as the cartesian product of several ranges, take constant memory. Checking if
+a state belongs to them and counting their states takes constant time, and every state has
+an index, computed arithmetically from the state itself.
+
+The automata classes in the automata module accept these sets as their states without
+materializing them, using the index of each state instead of a hash table.
+"""
+
+import abc
+import itertools
+from collections.abc import Mapping, Set
+from typing import Any, Iterable, Iterator
+
+
+class StateSpace(Set):
+    """
+    Base class for lazy sets of states
+
+    Every state of a state space has an index, from 0 to the number of states, in the order
+    the states are iterated in. Subclasses must implement __contains__, __len__, __iter__,
+    index and state_at.
+    """
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable) -> frozenset:
+        # Set operations between state spaces create regular sets
+        return frozenset(it)
+
+    @abc.abstractmethod
+    def index(self, state: Any) -> int:
+        """
+        Returns the index of the given state
+
+        Raises:
+            ValueError: If the state is not part of the space
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def state_at(self, index: int) -> Any:
+        """
+        Returns the state with the given index, counting from the end if negative
+
+        Raises:
+            IndexError: If the index is out of range
+        """
+        raise NotImplementedError
+
+    def __getitem__(self, index: int) -> Any:
+        return self.state_at(index)
+
+    def indexer(self) -> "StateIndex":
+        """
+        Returns a mapping from each state to its index
+        """
+        return StateIndex(self)
+
+    def _check_index(self, index: int) -> int:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError(f"State index {index} out of range")
+        return index
+
+    __hash__ = None  # type: ignore
+
+
+class StateIndex(Mapping):
+    """
+    Read-only mapping from each state of a state space to its index
+
+    Indices are computed arithmetically by the state space, so the mapping takes
+    constant memory.
+
+    Args:
+        space (StateSpace): The state space to index
+    """
+
+    def __init__(self, space: StateSpace) -> None:
+        self.space = space
+
+    def __getitem__(self, state: Any) -> int:
+        if state not in self.space:
+            raise KeyError(state)
+        return self.space.index(state)
+
+    def __contains__(self, state: Any) -> bool:
+        return state in self.space
+
+    def __iter__(self) -> Iterator:
+        return iter(self.space)
+
+    def __len__(self) -> int:
+        return len(self.space)
+
+
+class Range(StateSpace):
+    """
+    Lazy set of the integers or characters between a and b, inclusive
+
+    Args:
+        a (int | str): The first integer or character of the range
+        b (int | str): The last integer or character of the range
+
+    Like between and between_char, a range of characters is given by its first and last
+    characters. The index of each element is its distance to the first element.
+    """
+
+    def __init__(self, a: int | str, b: int | str) -> None:
+        if isinstance(a, str) != isinstance(b, str):
+            raise TypeError("Both ends of a range must be integers or characters")
+
+        # Characters are stored as their code points, and only converted back when returned
+        self.chars = isinstance(a, str)
+        self.start: int = ord(a) if isinstance(a, str) else a
+        self.stop: int = (ord(b) if isinstance(b, str) else b) + 1
+
+    def _code(self, value: Any) -> int | None:
+        # The integer a value is stored as, or None if it can't belong to the range
+        if self.chars:
+            if isinstance(value, str) and len(value) == 1:
+                return ord(value)
+            return None
+        return value if isinstance(value, int) else None
+
+    def _value(self, code: int) -> int | str:
+        return chr(code) if self.chars else code
+
+    def __contains__(self, value: Any) -> bool:
+        code = self._code(value)
+        return code is not None and self.start <= code < self.stop
+
+    def __len__(self) -> int:
+        return max(0, self.stop - self.start)
+
+    def __iter__(self) -> Iterator:
+        if self.chars:
+            return map(chr, range(self.start, self.stop))
+        return iter(range(self.start, self.stop))
+
+    def index(self, state: Any) -> int:
+        code = self._code(state)
+        if code is None or not self.start <= code < self.stop:
+            raise ValueError(f"{state!r} is not in {self!r}")
+        return code - self.start
+
+    def state_at(self, index: int) -> Any:
+        return self._value(self.start + self._check_index(index))
+
+    def __repr__(self) -> str:
+        return f"Range({self._value(self.start)!r}, {self._value(self.stop - 1)!r})"
+
+
+class _Values(StateSpace):
+    """
+    State space of an explicit sequence of values, used for the factors of a ProductSpace
+    given as regular iterables
+    """
+
+    def __init__(self, values: Iterable) -> None:
+        self.values = tuple(dict.fromkeys(values))
+        self.positions = {value: i for i, value in enumerate(self.values)}
+
+    def __contains__(self, value: Any) -> bool:
+        try:
+            return value in self.positions
+        except TypeError:
+            return False
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.values)
+
+    def index(self, state: Any) -> int:
+        if state not in self:
+            raise ValueError(f"{state!r} is not in {self!r}")
+        return self.positions[state]
+
+    def state_at(self, index: int) -> Any:
+        return self.values[self._check_index(index)]
+
+    def __repr__(self) -> str:
+        return repr(list(self.values))
+
+
+class ProductSpace(StateSpace):
+    """
+    Lazy cartesian product of several sets
+
+    Args:
+        *factors (Iterable): The sets to multiply, either state spaces or regular iterables
+
+    The states are tuples with an element of each factor, iterated in the same order as
+    itertools.product. The index of a state is computed from the indices of its elements
+    as a mixed-radix number, where the last factor changes fastest.
+    """
+
+    def __init__(self, *factors: Iterable) -> None:
+        self.factors = tuple(
+            factor if isinstance(factor, StateSpace) else _Values(factor)
+            for factor in factors
+        )
+
+        # Weight of the index of each element in the index of the state
+        self.strides = []
+        stride = 1
+        for factor in reversed(self.factors):
+            self.strides.append(stride)
+            stride *= len(factor)
+        self.strides.reverse()
+        self.length = stride
+
+    def __contains__(self, state: Any) -> bool:
+        return (
+            isinstance(state, tuple)
+            and len(state) == len(self.factors)
+            and all(value in factor for value, factor in zip(state, self.factors))
+        )
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __iter__(self) -> Iterator:
+        return itertools.product(*self.factors)
+
+    def index(self, state: Any) -> int:
+        if state not in self:
+            raise ValueError(f"{state!r} is not in {self!r}")
+        return sum(
+            factor.index(value) * stride
+            for value, factor, stride in zip(state, self.factors, self.strides)
+        )
+
+    def state_at(self, index: int) -> Any:
+        index = self._check_index(index)
+        return tuple(
+            factor.state_at(index // stride % len(factor))
+            for factor, stride in zip(self.factors, self.strides)
+        )
+
+    def __repr__(self) -> str:
+        return f"ProductSpace({', '.join(repr(factor) for factor in self.factors)})"
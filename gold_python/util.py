@@ -1,24 +1,61 @@
 from typing import Any, Callable, Iterable
 
+from gold_python.exceptions import WrongSymbolException
 
-def combine(functions, *args):
+
+class _NoTransition:
+    """
+    Type of the NO_TRANSITION sentinel
+    """
+
+    def __repr__(self) -> str:
+        return "NO_TRANSITION"
+
+    def __reduce__(self) -> str:
+        return "NO_TRANSITION"
+
+
+NO_TRANSITION = _NoTransition()
+"""
+Value returned by a delta-like function when there is no transition for its arguments.
+
+Returning this value is cheaper than raising an exception, and does not hide actual errors.
+"""
+
+NoTransition = _NoTransition
+"""
+Type of NO_TRANSITION, for annotating delta-like functions returning it, such as ``int | NoTransition``
+"""
+
+
+def combine(functions, *args, strict: bool = False):
     """
     Combines the results of multiple delta functions and returns every state that returns a different state. This is used on the deltafunc decorator for Non-Deterministic Finite Automata
+
+    Functions returning None or NO_TRANSITION have no transition. Unless strict is True,
+    functions raising an exception are also considered to have no transition.
     """
     nextStates = []
     for func in functions:
-        try:
+        if strict:
             state = func(*args)
-        except:
-            continue
-        if state != None:
+        else:
+            try:
+                state = func(*args)
+            except:
+                continue
+        if state is not None and state is not NO_TRANSITION:
             nextStates.append(state)
     return nextStates
 
 
-def combine_stack(functions, *args):
+def combine_stack(functions, *args, strict: bool = False):
     """
     Combines the results of multiple delta functions and the state of the stacks within the calls and returns every new state as well as stack result. This is used on the pushdownfunc decorator for Pushdown Automata
+
+    Functions returning None or NO_TRANSITION have no transition. Unless strict is True,
+    functions raising an exception are also considered to have no transition. Functions
+    popping the wrong symbols from the stack never have a transition.
     """
     nextStates = []
     mutableArgs = list(args)
@@ -27,14 +64,18 @@ def combine_stack(functions, *args):
         mutableArgs[-2] = stack.__copy__()
         try:
             state = func(*mutableArgs)
+        except WrongSymbolException:
+            continue
         except:
+            if strict:
+                raise
             continue
-        if state != None:
+        if state is not None and state is not NO_TRANSITION:
             nextStates.append((state, mutableArgs[-2]))
     return nextStates
 
 
-def call_func_iterable(func: Callable, args: Iterable | Any, *constants: Iterable):
+def call_func_iterable(func: Callable, args: Iterable | Any, *constants: Any):
     """
     Calls the function by splitting the args into different calls depending if the args
     paremeter is an iterable or not. All other arguments are supplied to the right of the function in the same order
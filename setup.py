@@ -20,7 +20,8 @@ setup(
   install_requires=[
           'networkx',
           'anytree',
-          'graphviz'
+          'graphviz',
+          'numpy'
       ],
   classifiers=[
     'Development Status :: 4 - Beta',
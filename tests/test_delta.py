@@ -6,8 +6,10 @@ along with the code formatter.
 """
 
 import __future__
+import pytest
 from typing import Any  # noqa: F401
 from gold_python import *  # noqa: F401
+from gold_python.automata.pushdown import AutomatonStack
 
 
 class TestDelta:  # noqa: D101
@@ -34,3 +36,81 @@ class TestDelta:  # noqa: D101
 
         assert trans(0, "a")[0] == 0
         assert trans(0, 0, "a")[0] == 1
+
+    def test_pure(self) -> None:  # noqa: D102
+        calls = []
+
+        @deltafunc(pure=True, maxsize=2)
+        def delta(state: int, symbol: str) -> int:
+            calls.append((state, symbol))
+            return state + 1
+
+        assert delta(0, "a") == [1]
+        assert delta(0, "a") == [1]
+        assert delta(1, "a") == [2]
+        assert len(calls) == 2
+        assert delta.cache_info() == CacheInfo(1, 2, 2, 2)
+
+        delta(2, "a")
+        assert delta.cache_info().currsize == 2
+
+        @delta.register
+        def _(state: int, extra: int, symbol: str) -> int:
+            return state + extra
+
+        assert delta.cache_info() == CacheInfo(0, 0, 2, 0)
+        assert delta(1, 2, "a") == [3]
+        assert delta([1], "a") == []
+
+        # Equal arguments of different types are cached separately
+        assert delta(True, "a") == [2]
+        assert delta.cache_info().misses == 2
+
+        @deltafunc(pure=True, maxsize=0)
+        def uncached(state: int, symbol: str) -> int:
+            return state
+
+        @deltafunc(pure=True, maxsize=None)
+        def unbounded(state: int, symbol: str) -> int:
+            return state
+
+        for state in range(3):
+            assert uncached(state, "a") == unbounded(state, "a") == [state]
+        assert uncached.cache_info() == CacheInfo(0, 3, 0, 0)
+        assert unbounded.cache_info() == CacheInfo(0, 3, None, 3)
+
+        with pytest.raises(ValueError):
+            pushdownfunc(pure=True)
+
+    def test_no_transition(self) -> None:  # noqa: D102
+        @deltafunc(strict=True)
+        def delta(state: int, symbol: str) -> Any:
+            if symbol == "":
+                return NO_TRANSITION
+            return state + 1
+
+        @delta.register(symbols="b")
+        def _(state: int, symbol: str) -> int:
+            return state + 2
+
+        @delta.register(states=[(0, 1)], symbols=["a"])
+        def _(x: int, y: int, symbol: str) -> int:
+            return x + y
+
+        assert delta(0, "") == []
+        assert delta(0, "a") == [1]
+        assert delta(0, "b") == [1, 2]
+        assert delta(0, 1, "a") == [1]
+        assert delta(1, 1, "a") == []
+        assert delta(0, 1, "b") == []
+
+        with pytest.raises(TypeError):
+            delta("0", "a")
+
+    def test_pushdown_no_transition(self) -> None:  # noqa: D102
+        @pushdownfunc(strict=True)
+        def delta(state: int, stack: Any, symbol: str) -> Any:
+            stack.pop("x")
+            return state
+
+        assert delta(0, AutomatonStack(), "a") == []
@@ -6,11 +6,26 @@ along with the code formatter.
 """
 
 import __future__
+import io
+import mmap
+import networkx as nx
+import pytest
 from gold_python import *  # noqa: F401
+from gold_python.exceptions import (
+    AlphabetMismatchException,
+    InitialStateNotFoundException,
+    OutputSymbolNotFoundException,
+    StateNotFoundException,
+    SymbolNotFoundException,
+    TableFormatException,
+)
+from gold_python.sets import ProductSpace, Range, between, product
+from gold_python.automata.table import TransitionTable
+from gold_python.util import call_func_iterable
 
 
 class TestDeterministic:  # noqa: D101
-    def test_deterministic(self) -> None:
+    def test_deterministic(self) -> None:  # noqa: D102
         @deltafunc
         def delta(state: int, symbol: str) -> tuple[int, int] | int:
             if state % 2 == 0:
@@ -33,7 +48,7 @@ class TestDeterministic:  # noqa: D101
         assert not automata.accepts_input("a")
         assert automata.accepts_input("aa")
 
-    def test_transducer(self) -> None:
+    def test_transducer(self) -> None:  # noqa: D102
         @deltafunc
         def delta(state: int, _: str) -> tuple[int, int] | int:
             if state % 2 == 0:
@@ -68,3 +83,276 @@ class TestDeterministic:  # noqa: D101
         assert automata.get_output("a")[0] == "a"
         assert automata.get_output("aa")[0] == "ac"
         assert automata.get_output("aaa")[0] == "acb"
+
+    def test_transition_table(self) -> None:  # noqa: D102
+        @deltafunc
+        def delta(state: int, symbol: str) -> int:
+            return (state + int(symbol)) % 3
+
+        automata = DeterministicAutomata([0, 1, 2], "01", 0, [0], delta)
+        table = automata.table
+
+        assert table.transitions.shape == (3, 2)
+        for state in [0, 1, 2]:
+            for symbol in "01":
+                nextState = table.transitions[
+                    table.state_index[state], table.symbol_index[symbol]
+                ]
+                assert table.states[nextState] == delta(state, symbol)[0]
+
+        assert automata.accepts_input("111")
+        assert not automata.accepts_input("1001")
+
+        with pytest.raises(SymbolNotFoundException):
+            automata.accepts_input("012")
+
+        # Tuple states are split into arguments before reaching the table lookup
+        single = DeterministicAutomata.from_table(
+            TransitionTable([(0,), (1,)], ["a"], [[1], [0]], 0, [False, True])
+        )
+        assert call_func_iterable(single.delta, (0,), "a") == [(1,)]
+
+    def test_accepts_many(self) -> None:  # noqa: D102
+        @deltafunc
+        def delta(state: int, symbol: str) -> int:
+            return (state + int(symbol)) % 3
+
+        automata = DeterministicAutomata([0, 1, 2], "012", 0, [0], delta)
+        tapes = ["", "1", "12", "111", "2222", "0", "2101"]
+
+        assert automata.accepts_many(tapes).tolist() == [
+            automata.accepts_input(tape) for tape in tapes
+        ]
+        assert automata.accepts_many([list(tape) for tape in tapes]).tolist() == [
+            automata.accepts_input(tape) for tape in tapes
+        ]
+
+        with pytest.raises(SymbolNotFoundException):
+            automata.accepts_many(["01", "13"])
+
+    def test_minimize(self) -> None:  # noqa: D102
+        @deltafunc
+        def delta(x: int, y: int, next: str) -> tuple[int, int]:
+            return ((x + int(next)) % 6, y)
+
+        states = product(between(0, 5), between(0, 1))
+        final_states = [(0, 0), (3, 0), (0, 1), (3, 1)]
+        automata = DeterministicAutomata(states, "01", (0, 0), final_states, delta)
+        minimal = automata.minimize()
+
+        assert len(minimal.states) == 3
+        assert minimal.initial_state == (0, 0)
+        for tape in ["", "0", "1", "11", "111", "1101", "10101", "111111"]:
+            assert minimal.accepts_input(tape) == automata.accepts_input(tape)
+        assert len(minimal.minimize().states) == 3
+
+    def test_runner(self) -> None:  # noqa: D102
+        @deltafunc
+        def delta(state: int, symbol: str) -> int:
+            return (state + int(symbol)) % 3
+
+        @transducerfunc
+        def trans(state: int, symbol: str) -> str:
+            return str(state)
+
+        automata = DeterministicTrasducer([0, 1, 2], "012", "012", 0, [0], delta, trans)
+        runner = automata.runner()
+
+        assert runner.transduce("12") == "01"
+        assert runner.state == 0
+        assert runner.is_accepting()
+        assert runner.transduce("2") + runner.transduce("21") == "021"
+        assert runner.state == 2
+        assert not runner.is_accepting()
+
+        with pytest.raises(SymbolNotFoundException):
+            runner.transduce("13")
+        assert runner.state == 2
+
+        runner.reset()
+        assert runner.state == 0
+        assert runner.transduce("1") == automata.get_output("1")[0]
+        runner.feed("2")
+        assert runner.state == 0
+
+    def test_bytes(self, tmp_path) -> None:  # noqa: D102
+        @deltafunc
+        def delta(state: int, symbol: int) -> int:
+            return 1 if symbol == ord("\n") else 0
+
+        automata = DeterministicAutomata([0, 1], range(256), 0, [1], delta)
+
+        assert automata.accepts_input(b"line\n")
+        assert not automata.accepts_input(bytearray(b"line\nline"))
+        assert automata.accepts_input(memoryview(b"\n"))
+        assert automata.accepts_many([b"a\n", b"", b"\na"]).tolist() == [
+            True,
+            False,
+            False,
+        ]
+
+        path = tmp_path / "tape"
+        path.write_bytes(b"line\n" * 100000)
+        with open(path, "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as tape:
+                assert automata.accepts_input(tape)
+
+        letters = DeterministicAutomata([0, 1], b"ab", 0, [1], delta)
+        assert not letters.accepts_input(b"abba")
+        with pytest.raises(SymbolNotFoundException):
+            letters.accepts_input(b"abc")
+
+    def test_transducer_writer(self) -> None:  # noqa: D102
+        @deltafunc
+        def delta(state: int, symbol: str) -> int:
+            return (state + 1) % 2
+
+        @transducerfunc
+        def trans(state: int, symbol: str) -> str:
+            return symbol * (state + 1)
+
+        automata = DeterministicTrasducer([0, 1], "ab", "ab", 0, [0], delta, trans)
+        writer = io.StringIO()
+        tape = "ab" * 5000
+
+        assert automata.get_output(tape, writer) == ("", True)
+        assert writer.getvalue() == "abb" * 5000
+        assert automata.get_output(tape)[0] == writer.getvalue()
+
+        with pytest.raises(OutputSymbolNotFoundException):
+            DeterministicTrasducer([0, 1], "abc", "ab", 0, [0], delta, trans)
+
+    def test_network(self) -> None:  # noqa: D102
+        @deltafunc
+        def delta(state: int, symbol: str) -> int:
+            return (state + int(symbol)) % 3
+
+        automata = DeterministicAutomata([0, 1, 2], "012", 0, [0], delta)
+
+        assert automata._network is None
+        assert len(automata.network.nodes) == 3
+        assert automata.network is automata.network
+        labels = automata.network.edges["0", "0"]["label"].split(", ")
+        assert labels == ["0"]
+        assert len(automata.network.edges) == 9
+
+        graph = nx.DiGraph()
+        automata.network = graph
+        assert automata.network is graph
+
+    def test_save(self, tmp_path) -> None:  # noqa: D102
+        @deltafunc
+        def delta(state: int, symbol: str) -> int:
+            return (state + int(symbol)) % 3
+
+        @transducerfunc
+        def trans(state: int, symbol: str) -> str:
+            return str(state)
+
+        automata = DeterministicAutomata([0, 1, 2], "012", 0, [0], delta)
+        automata.save(tmp_path / "automata")
+        loaded = DeterministicAutomata.load(tmp_path / "automata")
+
+        assert loaded.states == automata.states
+        assert loaded.initial_state == automata.initial_state
+        tapes = ["", "1", "12", "2211", "102"]
+        assert loaded.accepts_many(tapes).tolist() == [
+            automata.accepts_input(tape) for tape in tapes
+        ]
+        assert loaded.accepts_input("21") and not loaded.accepts_input("11")
+
+        # Memory-mapped tables run over the mapped array until the mirror is built
+        assert loaded.table.mapped and not automata.table.mapped
+        assert "_rows" not in loaded.table.__dict__
+        loaded.table.mirror()
+        assert loaded.accepts_input("21") and not loaded.accepts_input("11")
+
+        transducer = DeterministicTrasducer(
+            [0, 1, 2], "012", "012", 0, [0], delta, trans
+        )
+        transducer.save(tmp_path / "transducer")
+        loaded = DeterministicAutomata.load(tmp_path / "transducer", mmap_mode=None)
+
+        assert isinstance(loaded, DeterministicTrasducer)
+        assert loaded.output_alphabet == set("012")
+        assert loaded.get_output("1221") == transducer.get_output("1221")
+
+        with pytest.raises(TableFormatException):
+            DeterministicTrasducer.load(tmp_path / "automata")
+        with pytest.raises(TableFormatException):
+            DeterministicAutomata.load(tmp_path / "missing")
+
+        # Loading never writes to the saved files
+        saved = (tmp_path / "automata" / "transitions.npy").read_bytes()
+        with pytest.raises(ValueError):
+            DeterministicAutomata.load(tmp_path / "automata", mmap_mode="w+")  # type: ignore[arg-type]
+        assert (tmp_path / "automata" / "transitions.npy").read_bytes() == saved
+
+    def test_state_space(self) -> None:  # noqa: D102
+        @deltafunc
+        def delta(a: int, b: int, symbol: str) -> tuple:
+            return ((a + 1) % 4, b) if symbol == "a" else (a, (b + 1) % 5)
+
+        states = ProductSpace(Range(0, 3), Range(0, 4))
+        automata = DeterministicAutomata(states, "ab", (0, 0), [(2, 3)], delta)
+
+        assert automata.states is states
+        assert automata.table.states is states
+        assert automata.accepts_input("aabbb")
+        assert not automata.accepts_input("abab")
+        assert len(automata.minimize().states) == 20
+
+    def test_reachable(self) -> None:  # noqa: D102
+        @deltafunc
+        def delta(a: int, b: int, symbol: str) -> tuple:
+            # Only defined on the states reachable from (0, 0)
+            assert b == 0
+            return ((a + int(symbol)) % 4, b)
+
+        states = ProductSpace(Range(0, 3), Range(0, 99))
+        automata = DeterministicAutomata(
+            states, "12", (0, 0), [(3, 0)], delta, reachable=True
+        )
+
+        assert len(automata.table) == 4
+        assert automata.table.states[0] == (0, 0)
+        assert automata.accepts_input("12") and not automata.accepts_input("22")
+
+        @deltafunc
+        def escape(state: int, symbol: str) -> int:
+            return state + 1
+
+        with pytest.raises(StateNotFoundException):
+            DeterministicAutomata(range(100), "a", 0, [1], escape, reachable=True)
+        with pytest.raises(InitialStateNotFoundException):
+            DeterministicAutomata([1, 2], "a", 0, [1], escape, reachable=True)
+
+    def test_operators(self) -> None:  # noqa: D102
+        @deltafunc
+        def mod2(state: int, symbol: str) -> int:
+            return (state + (symbol == "a")) % 2
+
+        @deltafunc
+        def mod3(state: int, symbol: str) -> int:
+            return (state + (symbol == "a")) % 3
+
+        even = DeterministicAutomata([0, 1], "ab", 0, [0], mod2)
+        third = DeterministicAutomata([0, 1, 2], "ba", 0, [0], mod3)
+
+        tapes = ["", "a", "aa", "aaa", "abab", "aaaaaa", "baaaab", "aaaaa"]
+        for tape in tapes:
+            first, second = even.accepts_input(tape), third.accepts_input(tape)
+            assert (even & third).accepts_input(tape) == (first and second)
+            assert (even | third).accepts_input(tape) == (first or second)
+            assert (even - third).accepts_input(tape) == (first and not second)
+            assert (~even).accepts_input(tape) == (not first)
+
+        assert len((even & third).table) == 6
+        assert len(even.union(even, minimize=True).table) == 2
+        assert (even - even).is_empty() and not even.is_empty()
+        assert (even & third).issubset(even) and not even.issubset(third)
+        assert (~~even).is_equivalent(even) and not even.is_equivalent(third)
+
+        letters = DeterministicAutomata([0, 1], "abc", 0, [0], mod2)
+        with pytest.raises(AlphabetMismatchException):
+            even & letters
@@ -6,8 +6,10 @@ along with the code formatter.
 """
 
 import __future__
+import pytest
 from gold_python import *
 from gold_python.automata.nondeterministic import NonDeterministicAutomata  # noqa: F401
+from gold_python.automata.util import StateInterner, Task
 
 
 class TestNonDeterministic:  # noqa: D101
@@ -64,3 +66,93 @@ class TestNonDeterministic:  # noqa: D101
         assert automata.accepts_input("a")
         assert automata.accepts_input("aa")
         assert automata.accepts_input("aaa")
+
+    def test_determinize(self) -> None:
+        @deltafunc
+        def delta(state: int, symbol: str) -> int:
+            if symbol == "b" and state == 0:
+                return 0
+            if symbol != "":
+                return (state + 1) % 4
+            return 2
+
+        @delta.register
+        def _(state: int, symbol: str) -> int:
+            if symbol == "a":
+                return (state + 2) % 4
+            raise Exception("No path found")
+
+        automata = NonDeterministicAutomata([0, 1, 2, 3], "ab", 0, [3], delta)
+        deterministic = automata.determinize()
+        lazy = automata.lazy_determinize(max_states=2)
+
+        tapes = ["", "a", "b", "ab", "ba", "aab", "bbb", "abab", "baab", "aaaa"]
+        for tape in tapes:
+            expected = automata.accepts_input(tape, engine="tree")
+            assert automata.accepts_input(tape, engine="set") == expected
+            assert deterministic.accepts_input(tape) == expected
+            assert lazy.accepts_input(tape) == expected
+
+        assert len(lazy) <= 2
+        with pytest.raises(ValueError):
+            automata.lazy_determinize(max_states=0)
+
+        # The delta function of the determinized automata looks up its table, even when
+        # its frozenset states are split into several arguments
+        rebuilt = DeterministicAutomata(
+            deterministic.states,
+            deterministic.alphabet,
+            deterministic.initial_state,
+            list(deterministic.final_states),
+            deterministic.delta,
+        )
+        for tape in tapes:
+            assert rebuilt.accepts_input(tape) == deterministic.accepts_input(tape)
+
+    def test_state_interner(self) -> None:
+        interner = StateInterner([(0, "a"), (1, "b")])
+
+        assert interner.intern((1, "b")) == 1
+        assert interner.intern((2, "c")) == 2
+        assert interner.intern_all([(0, "a"), (2, "c")]) == frozenset([0, 2])
+        assert interner.state(2) == (2, "c") and len(interner) == 3
+
+        task = Task((0, "a"), "ab", "a")
+        assert not hasattr(task, "__dict__")
+        assert Task.from_configuration("ab", task.configuration()).tape == "ab"
+
+    def test_workers(self) -> None:
+        @deltafunc
+        def delta(state: int, symbol: str) -> int | NoTransition:
+            if symbol == "":
+                return NO_TRANSITION
+            return (state * 2 + (symbol == "b")) % 7
+
+        @delta.register(symbols="a")
+        def _(state: int, symbol: str) -> int:
+            return (state + 3) % 7
+
+        automata = NonDeterministicAutomata(range(7), "ab", 0, [5], delta)
+
+        tapes = ["", "a", "ab", "bab", "abba", "ab" * 40, "b" * 60 + "a"]
+        for tape in tapes:
+            expected = automata.accepts_input(tape)
+            assert automata.accepts_input(tape, engine="tree", workers=2) == expected
+
+        with pytest.raises(ValueError):
+            automata.accepts_input("ab", workers=2)
+
+    def test_accepts_input_path(self) -> None:
+        @deltafunc
+        def delta(state: int, symbol: str) -> int:
+            if symbol != "":
+                return (state + 1) % 4
+            raise Exception("No path found")
+
+        automata = NonDeterministicAutomata([0, 1, 2, 3], "a", 0, [3], delta)
+
+        assert automata.accepts_input_path("aaa") == (
+            True,
+            [(3, ""), (2, "a"), (1, "aa"), (0, "aaa")],
+        )
+        assert automata.accepts_input_path("aa") == (False, [])
@@ -20,3 +20,29 @@ class TestOperations:  # noqa: D101
         """Test the product function."""
         assert len(product(between(0, 9), between(0, 9))) == 100
         assert len(product(between(0, 9), between(0, 9), between(0, 9))) == 1000
+
+    def test_range(self) -> None:
+        """Test the Range state space."""
+        numbers = Range(3, 7)
+        assert len(numbers) == 5
+        assert list(numbers) == between(3, 7)
+        assert 7 in numbers and 8 not in numbers and "3" not in numbers
+        assert numbers.index(5) == 2 and numbers.state_at(-1) == 7
+
+        letters = Range("a", "e")
+        assert list(letters) == between_char("a", "e")
+        assert letters.index("c") == 2 and letters.state_at(2) == "c"
+        assert set(letters) == {"a", "b", "c", "d", "e"}
+
+    def test_product_space(self) -> None:
+        """Test the ProductSpace state space."""
+        space = ProductSpace(Range(0, 9), Range(0, 9), ["x", "y"])
+        assert len(space) == 200
+        assert (3, 4, "y") in space and (3, 4, "z") not in space and 3 not in space
+        assert list(space) == sorted(product(between(0, 9), between(0, 9), "xy"))
+        for i, state in enumerate(space):
+            assert space.index(state) == i and space.state_at(i) == state
+
+        huge = ProductSpace(*[Range(0, 99)] * 6)
+        assert len(huge) == 100**6
+        assert huge.state_at(huge.index((1, 2, 3, 4, 5, 6))) == (1, 2, 3, 4, 5, 6)
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""Basic test suite.
+
+There are some 'noqa: F401' in this file to just test the isort import sorting
+along with the code formatter.
+"""
+
+import __future__
+import multiprocessing as mp
+import pickle
+from gold_python import *  # noqa: F401
+from gold_python.automata.nondeterministic import NonDeterministicAutomata
+from gold_python.sets import ProductSpace, Range
+
+
+@deltafunc
+def count(state: int, symbol: str) -> int:
+    return (state + (symbol == "a")) % 3
+
+
+@transducerfunc
+def upper(state: int, symbol: str) -> str:
+    return symbol.upper()
+
+
+class TestParallel:  # noqa: D101
+    def test_pickle(self) -> None:
+        automata = DeterministicAutomata([0, 1, 2], "ab", 0, [0], count)
+        copy = pickle.loads(pickle.dumps(automata))
+
+        assert copy.delta is count
+        assert copy.accepts_input("abaab")
+        assert not copy.accepts_input("ab")
+
+    def test_run_corpus(self, tmp_path) -> None:
+        automata = DeterministicAutomata([0, 1, 2], "ab", 0, [0], count)
+        tapes = ["", "a", "aaa", "abab", "baaab"] * 50
+        expected = [automata.accepts_input(tape) for tape in tapes]
+
+        assert list(run_corpus(automata, tapes, workers=2, chunksize=7)) == expected
+
+        unordered = run_corpus(automata, tapes, workers=2, chunksize=7, ordered=False)
+        assert sorted(unordered) == list(enumerate(expected))
+
+        path = tmp_path / "corpus.txt"
+        path.write_text("\n".join(tapes) + "\n")
+        assert list(run_corpus(automata, path, workers=2)) == expected
+
+        transducer = DeterministicTrasducer([0, 1, 2], "ab", "AB", 0, [0], count, upper)
+        assert list(run_corpus(transducer, ["aab", "aaa"], workers=2)) == [
+            ("AAB", False),
+            ("AAA", True),
+        ]
+
+        nondeterministic = NonDeterministicAutomata([0, 1, 2], "ab", 0, [0], count)
+        assert list(run_corpus(nondeterministic, tapes, workers=2)) == expected
+
+    def test_workers(self) -> None:
+        states = ProductSpace(Range(0, 2), Range(0, 2))
+
+        @deltafunc
+        def delta(a: int, b: int, symbol: str) -> tuple:
+            return ((a + 1) % 3, b) if symbol == "a" else (a, (b + 1) % 3)
+
+        automata = DeterministicAutomata(states, "ab", (0, 0), [(1, 2)], delta)
+        parallel = DeterministicAutomata(
+            states, "ab", (0, 0), [(1, 2)], delta, workers=2
+        )
+        reachable = DeterministicAutomata(
+            states, "ab", (0, 0), [(1, 2)], delta, reachable=True, workers=2
+        )
+
+        assert (parallel.table.transitions == automata.table.transitions).all()
+        assert len(reachable.table) == 9
+        for tape in ["", "abb", "ba", "bbba", "aaaabb"]:
+            expected = automata.accepts_input(tape)
+            assert parallel.accepts_input(tape) == expected
+            assert reachable.accepts_input(tape) == expected
+
+        transducer = DeterministicTrasducer(
+            [0, 1, 2], "ab", "AB", 0, [0], count, upper, workers=2
+        )
+        assert transducer.get_output("aab") == ("AAB", False)
+
+    def test_pool_context(self, monkeypatch) -> None:
+        from gold_python.automata.util import _pool_context
+
+        monkeypatch.setattr("sys.platform", "linux")
+        assert _pool_context().get_start_method() == "fork"
+        monkeypatch.setattr("sys.platform", "darwin")
+        assert _pool_context() is mp.get_context()
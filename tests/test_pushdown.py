@@ -6,9 +6,11 @@ along with the code formatter.
 """
 
 import __future__
+import pytest
 from gold_python import *
 from gold_python.automata.nondeterministic import NonDeterministicAutomata  # noqa: F401
 from gold_python.automata.pushdown import AutomatonStack, PushdownAutomata  # noqa: F401
+from gold_python.exceptions import WrongSymbolException
 
 
 class TestPushdown:  # noqa: D101
@@ -56,3 +58,130 @@ class TestPushdown:  # noqa: D101
         assert not automata.accepts_input("a")
         assert not automata.accepts_input("aa")
         assert automata.accepts_input("aaa")
+
+        for tape in ["", "a", "aa", "aaa", "aaaa"]:
+            assert automata.accepts_input(tape, engine="gss") == automata.accepts_input(
+                tape
+            )
+
+    def test_stack(self) -> None:
+        stack = AutomatonStack()
+        stack.push(1, 2)
+        copy = stack.__copy__()
+        copy.pop(2)
+        copy.push(3)
+
+        assert stack.list == [1, 2]
+        assert copy.list == [1, 3]
+        assert stack.peek(2, 1)
+        assert not stack.peek(1)
+        assert len(copy) == 2
+
+        assert stack != copy
+        copy.pop(3)
+        copy.push(2)
+        assert stack == copy
+        assert hash(stack) == hash(copy)
+        assert stack == AutomatonStack([1, 2])
+        assert len({stack, copy, AutomatonStack()}) == 2
+
+        with pytest.raises(WrongSymbolException):
+            stack.pop(1)
+        with pytest.raises(WrongSymbolException):
+            AutomatonStack().pop(1)
+
+        assert not hasattr(stack, "__dict__")
+
+    def test_palindromes(self) -> None:
+        @pushdownfunc
+        def delta(state: int, stack: AutomatonStack, symbol: str) -> int | NoTransition:
+            if state == 0 and symbol != "":
+                stack.push(symbol)
+                return 0
+            if state == 1 and symbol != "":
+                stack.pop(symbol)
+                return 1
+            return NO_TRANSITION
+
+        @delta.register(states=[0], symbols=[""])
+        def _(state: int, stack: AutomatonStack, symbol: str) -> int:
+            return 1
+
+        automata = PushdownAutomata([0, 1], "ab", 0, [1], delta)
+
+        assert automata.accepts_input("abba")
+        assert not automata.accepts_input("abab")
+        assert automata.accepts_input("ab" * 20 + "ba" * 20)
+        assert not automata.accepts_input("ab" * 20 + "ab" * 20)
+
+        bounded = PushdownAutomata([0, 1], "ab", 0, [1], delta, max_stack_depth=10)
+        assert bounded.accepts_input("ab" * 5 + "ba" * 5)
+        assert not bounded.accepts_input("ab" * 6 + "ba" * 6)
+
+        tapes = ["abba", "abab", "ab" * 20 + "ba" * 20, "ab" * 20 + "ab" * 20]
+        for tape in tapes:
+            expected = automata.accepts_input(tape)
+            assert automata.accepts_input(tape, workers=3) == expected
+
+    def test_gss(self) -> None:
+        @pushdownfunc
+        def delta(state: int, stack: AutomatonStack, symbol: str) -> int | NoTransition:
+            if symbol == "a":
+                stack.push("x")
+            elif symbol == "b":
+                stack.pop("x")
+            else:
+                return NO_TRANSITION
+            return 0
+
+        @delta.register
+        def _(state: int, stack: AutomatonStack, symbol: str) -> int | NoTransition:
+            if symbol == "a":
+                stack.pop("x", "x")
+            elif symbol == "b":
+                stack.push("x", "x")
+            else:
+                return NO_TRANSITION
+            return 0
+
+        @delta.register(symbols="b")
+        def _(state: int, stack: AutomatonStack, symbol: str) -> int | NoTransition:
+            if len(stack) % 3 == 0 and stack.peek("x"):
+                return 0
+            return NO_TRANSITION
+
+        automata = PushdownAutomata([0], "ab", 0, [0], delta)
+
+        tapes = ["", "ab", "ba", "aab", "abb", "abab", "bbaaaa", "aaabbbab", "abbbaa"]
+        for tape in tapes:
+            assert automata.accepts_input(tape, engine="gss") == automata.accepts_input(
+                tape
+            )
+        assert automata.accepts_input("ab" * 30 + "bbaaaa", engine="gss")
+
+        # Stacks merged into the same nodes are still cut off at the maximum depth
+        @pushdownfunc
+        def grow(state: int, stack: AutomatonStack, symbol: str) -> int | NoTransition:
+            if symbol == "a":
+                stack.push("x")
+            elif symbol == "b":
+                stack.pop("x")
+            else:
+                return NO_TRANSITION
+            return 0
+
+        @grow.register
+        def _(state: int, stack: AutomatonStack, symbol: str) -> int | NoTransition:
+            if symbol == "a":
+                stack.push("x", "x")
+            elif symbol == "b":
+                stack.pop("x", "x")
+            else:
+                return NO_TRANSITION
+            return 0
+
+        for depth, tape in [(2, "aabbb"), (3, "aabbbb"), (3, "abab")]:
+            limited = PushdownAutomata([0], "ab", 0, [0], grow, max_stack_depth=depth)
+            assert limited.accepts_input(tape, engine="gss") == limited.accepts_input(
+                tape, engine="tree"
+            )
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Basic test suite.
+
+There are some 'noqa: F401' in this file to just test the isort import sorting
+along with the code formatter.
+"""
+
+import __future__
+import re
+import pytest
+from gold_python import regex
+from gold_python.exceptions import RegexSyntaxException, SymbolNotFoundException
+
+
+class TestRegex:  # noqa: D101
+    def test_compile(self) -> None:
+        patterns = ["(ab|c)*d+", "a?b?c", r"\d+(\.\d+)?", "[a-c]x|y*", "()|a", "a+|"]
+        tapes = [
+            "",
+            "a",
+            "c",
+            "d",
+            "abcd",
+            "abdd",
+            "bc",
+            "3.14",
+            "3.",
+            "42",
+            "bx",
+            "yy",
+        ]
+
+        for pattern in patterns:
+            automata = regex.compile(pattern)
+            for tape in tapes:
+                if set(tape) <= automata.alphabet:
+                    expected = re.fullmatch(pattern, tape) is not None
+                    assert automata.accepts_input(tape) == expected, (pattern, tape)
+
+        assert len(regex.compile("(a|b)*abb").table) == 4
+        assert regex.compile("(a|b)*abb").is_equivalent(regex.compile("(a*b*)*abb"))
+
+    def test_alphabet(self) -> None:
+        automata = regex.compile("[^a].", alphabet="abc")
+        assert automata.accepts_input("ba") and not automata.accepts_input("ab")
+        assert regex.compile(regex.escape("a.b"), alphabet="ab.").accepts_input("a.b")
+
+        nondeterministic = regex.to_nfa("a*b", alphabet="abc")
+        assert nondeterministic.accepts_input("aab")
+        assert not nondeterministic.accepts_input("aac")
+
+        with pytest.raises(SymbolNotFoundException):
+            regex.compile("abc", alphabet="ab")
+        for pattern in ["(a", "a)", "*a", "[b-a]", ".", "[^a]", "a\\"]:
+            with pytest.raises(RegexSyntaxException):
+                regex.compile(pattern)
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Basic test suite.
+
+There are some 'noqa: F401' in this file to just test the isort import sorting
+along with the code formatter.
+"""
+
+import __future__
+import mmap
+import pytest
+from gold_python import regex
+from gold_python.automata import DeterministicAutomata, Lexer, tokenize
+from gold_python.delta import deltafunc
+from gold_python.exceptions import TokenNotFoundException
+
+
+def longest_matches(automata, tape):
+    # Reference search, trying every end from every start
+    position = 0
+    while position < len(tape):
+        ends = [
+            end
+            for end in range(position + 1, len(tape) + 1)
+            if automata.accepts_input(tape[position:end])
+        ]
+        if ends:
+            yield position, max(ends)
+            position = max(ends)
+        else:
+            position += 1
+
+
+class TestScan:  # noqa: D101
+    def test_finditer(self) -> None:
+        tapes = ["", "a", "xaab", "abababb", "aaaaaaaaab", "bbxabx", "ab" * 20 + "x"]
+        for pattern in ["a+b", "(ab)*b", "a*|b", "(a|b)*abb"]:
+            automata = regex.compile(pattern, "abx")
+            for tape in tapes:
+                assert list(automata.finditer(tape)) == list(
+                    longest_matches(automata, tape)
+                )
+
+        # Symbols outside the alphabet are never part of a match
+        assert list(regex.compile("a+").finditer("aa-a")) == [(0, 2), (3, 4)]
+
+        @deltafunc
+        def byte(state: int, symbol: int) -> int:
+            return 1 if state == 0 and symbol == ord("a") else 2
+
+        automata = DeterministicAutomata([0, 1, 2], range(256), 0, [1], byte)
+        with mmap.mmap(-1, 6) as data:
+            data.write(b"banana")
+            assert list(automata.finditer(data)) == [(1, 2), (3, 4), (5, 6)]
+
+    def test_tokenize(self, tmp_path) -> None:
+        tokens = {
+            "if": regex.compile("if"),
+            "name": regex.compile("[a-z]+"),
+            "number": regex.compile(r"\d+"),
+            "space": regex.compile(" +"),
+        }
+        text = "if iffy 42 x"
+        assert [
+            (token, text[start:end]) for token, start, end in tokenize(text, tokens)
+        ] == [
+            ("if", "if"),
+            ("space", " "),
+            ("name", "iffy"),
+            ("space", " "),
+            ("number", "42"),
+            ("space", " "),
+            ("name", "x"),
+        ]
+
+        lexer = Lexer(tokens)
+        with pytest.raises(TokenNotFoundException):
+            list(lexer.tokenize("if 4-2"))
+
+        # Bytes are read as latin-1 characters by tables built from regular expressions
+        (tmp_path / "text").write_bytes(text.encode())
+        with open(tmp_path / "text", "rb") as file:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                assert list(lexer.tokenize(data)) == list(lexer.tokenize(text))
+        assert list(regex.compile("a+").finditer(b"banana")) == [(1, 2), (3, 4), (5, 6)]